@@ -100,6 +100,28 @@ class DatabaseAbstraction:
         """
         self.connection.rollback()
 
+    def savepoint(self, name):
+        """ Sets a savepoint in the current transaction
+        """
+        with self.cursor() as cursor:
+            self.execute(cursor, self._format.format_savepoint(name))
+
+    def rollback_to_savepoint(self, name):
+        """ Rolls back the current transaction to a savepoint
+        
+        The savepoint is kept, so the transaction can be rolled back to it again.
+        It also recovers a transaction aborted by an error after the savepoint.
+        
+        """
+        with self.cursor() as cursor:
+            self.execute(cursor, self._format.format_rollback_to_savepoint(name))
+
+    def release_savepoint(self, name):
+        """ Releases a savepoint, the changes made after it are kept
+        """
+        with self.cursor() as cursor:
+            self.execute(cursor, self._format.format_release_savepoint(name))
+
     ### Transaction context
 
     @contextlib.contextmanager
@@ -124,7 +146,12 @@ class DatabaseAbstraction:
         # http://www.velocityreviews.com/forums/t649192-psycopg2-and-large-queries.html
         if named:
             cursor_name = 'cursor_%d' % next(self.named_cursor_counter)
-            cursor = self.connection.cursor(cursor_name)
+            # Named cursors can only be used with transactions disabled (in autocommit
+            # mode) if they are held open after the implicit commit of the query
+            cursor = self.connection.cursor(cursor_name, withhold=self.connection.autocommit)
+            # Iterating over a named cursor directly fetches this many rows
+            # at once as well, like fetchmany does with arraysize
+            cursor.itersize = constants.CURSOR_ARRAYSIZE
         else:
             cursor = self.connection.cursor()
 
@@ -167,11 +194,27 @@ class DatabaseAbstraction:
 
         cursor.executemany(sql, parameter_tuple_list)
 
+    def execute_insert_many(self, cursor, sql, parameter_tuple_list, returning_id=False):
+        """ Executes a single row INSERT statement on the given cursor for each parameter_tuple
+        
+        Backends can override it to insert all the rows with multi-row INSERT statements.
+        
+        Returns the list of the IDs generated for the rows inserted if returning_id is
+        true and the backend supports it, otherwise None. The caller has to query
+        the last value of the sequence used to find out the IDs in the latter case.
+        
+        """
+        self.executemany(cursor, sql, parameter_tuple_list)
+
     def execute_statement_list(self, cursor, statement_list, ignore_errors=False):
         """ Executes a list of SQL statements on the given cursor 
         
         statement_list = [(sql, parameter_tuple)*]
         
+        Unless errors are ignored, statements without parameters are executed
+        as a single script, so creating a table with all its indexes and
+        triggers takes a single round trip to the database server.
+        
         NOTE: It is not suitable to retrieve a result set, since the cursor
               is closed right after executing the statements.
         
@@ -194,8 +237,26 @@ class DatabaseAbstraction:
                 else:
                     cursor.execute(self._format.format_release_savepoint('execute_statement_list_ignoring_errors'))
         else:
+            # Consecutive statements without parameters are sent as a single script
+            script_list = []
             for sql, parameter_tuple in statement_list:
-                cursor.execute(sql, parameter_tuple)
+                if parameter_tuple:
+                    if script_list:
+                        cursor.execute(';\n'.join(script_list), ())
+                        del script_list[:]
+                    cursor.execute(sql, parameter_tuple)
+                else:
+                    script_list.append(sql.rstrip().rstrip(';'))
+            if script_list:
+                cursor.execute(';\n'.join(script_list), ())
+
+    def execute_query(self, cursor, sql, parameter_tuple=()):
+        """ Executes an SQL query on the given cursor, the result set is fetched by the caller
+        
+        Backends can override it to execute queries more efficiently.
+        
+        """
+        cursor.execute(sql, parameter_tuple)
 
     def execute_and_fetch_one(self, cursor, sql, parameter_tuple=()):
         """ Executes an SQL query on the given cursor and returns the first row of result set if any
@@ -206,7 +267,7 @@ class DatabaseAbstraction:
         if constants.LOG_SQL_STATEMENTS:
             util.log('SQL statement: execute_and_fetch_one(%r, %r)', sql, parameter_tuple)
 
-        cursor.execute(sql, parameter_tuple)
+        self.execute_query(cursor, sql, parameter_tuple)
         row = cursor.fetchone()
 
         if constants.LOG_SQL_RESULT_ROWS:
@@ -221,7 +282,7 @@ class DatabaseAbstraction:
             util.log('SQL statement: execute_and_fetch_iter(%r, %r)', sql, parameter_tuple)
 
         cursor.arraysize = constants.CURSOR_ARRAYSIZE
-        cursor.execute(sql, parameter_tuple)
+        self.execute_query(cursor, sql, parameter_tuple)
 
         while 1:
             row_list = cursor.fetchmany()
@@ -243,7 +304,7 @@ class DatabaseAbstraction:
             util.log('SQL statement: execute_and_fetch_dict_iter(%r, %r)', sql, parameter_tuple)
 
         cursor.arraysize = constants.CURSOR_ARRAYSIZE
-        cursor.execute(sql, parameter_tuple)
+        self.execute_query(cursor, sql, parameter_tuple)
 
         field_name_list = None
 
@@ -265,6 +326,36 @@ class DatabaseAbstraction:
 
                 yield row
 
+    def execute_and_fetch_record_iter(self, cursor, record_class, sql, parameter_tuple=()):
+        """ Executes an SQL query on the given cursor and yields a record for each row of result set
+        
+        The records are constructed for a whole batch of fetched rows at once.
+        
+        """
+        if constants.LOG_SQL_RESULT_ROWS:
+            for row in self.execute_and_fetch_iter(cursor, sql, parameter_tuple):
+                yield record_class(*row)
+            return
+
+        if constants.LOG_SQL_STATEMENTS:
+            util.log('SQL statement: execute_and_fetch_record_iter(%r, %r)', sql, parameter_tuple)
+
+        cursor.arraysize = constants.CURSOR_ARRAYSIZE
+        self.execute_query(cursor, sql, parameter_tuple)
+
+        while 1:
+            row_list = cursor.fetchmany()
+
+            if not row_list:
+                break
+
+            yield from itertools.starmap(record_class, row_list)
+
+    def execute_and_fetch_record_list(self, cursor, record_class, sql, parameter_tuple=()):
+        """ Executes an SQL query on the given cursor and returns a list of records for the result set
+        """
+        return list(self.execute_and_fetch_record_iter(cursor, record_class, sql, parameter_tuple))
+
     ### Select query helpers
 
     def get_record(self, record_class, clauses, parameter_tuple=()):
@@ -296,9 +387,7 @@ class DatabaseAbstraction:
         sql = self._format.format_select(clauses)
 
         with self.cursor() as cursor:
-            return [
-                record_class(*row)
-                for row in self.execute_and_fetch_iter(cursor, sql, parameter_tuple)]
+            return self.execute_and_fetch_record_list(cursor, record_class, sql, parameter_tuple)
 
     def get_record_iter(self, record_class, clauses, parameter_tuple=()):
         """ Yields records retrieved form the database
@@ -310,9 +399,8 @@ class DatabaseAbstraction:
 
         sql = self._format.format_select(clauses)
 
-        with self.cursor() as cursor:
-            for row in self.execute_and_fetch_iter(cursor, sql, parameter_tuple):
-                yield record_class(*row)
+        with self.cursor(named=True) as cursor:
+            yield from self.execute_and_fetch_record_iter(cursor, record_class, sql, parameter_tuple)
 
     ### Insert query helpers
 
@@ -362,7 +450,7 @@ class DatabaseAbstraction:
                     if self._SQL_IDENTITY_INSERT_SAVEPOINT:
                         self.execute(cursor, self._SQL_IDENTITY_INSERT_SAVEPOINT)
 
-                    self.execute(cursor, sql, parameter_tuple)
+                    id_list = self.execute_insert_many(cursor, sql, [parameter_tuple], serial)
 
                 except self.IntegrityError as reason:
 
@@ -378,7 +466,10 @@ class DatabaseAbstraction:
 
                     # Fill in id field of record object
                     if serial:
-                        record.id = self.get_last_value_of_last_sequence_used(cursor)
+                        if id_list is None:
+                            record.id = self.get_last_value_of_last_sequence_used(cursor)
+                        else:
+                            record.id = id_list[0]
 
                     return
 
@@ -431,7 +522,7 @@ class DatabaseAbstraction:
                 if self._SQL_IDENTITY_INSERT_SAVEPOINT:
                     self.execute(cursor, self._SQL_IDENTITY_INSERT_SAVEPOINT)
 
-                self.executemany(cursor, sql, parameter_tuple_list)
+                id_list = self.execute_insert_many(cursor, sql, parameter_tuple_list, serial)
 
             except self.IntegrityError:
 
@@ -448,12 +539,22 @@ class DatabaseAbstraction:
                 if self._SQL_IDENTITY_INSERT_RELEASE_SAVEPOINT:
                     self.execute(cursor, self._SQL_IDENTITY_INSERT_RELEASE_SAVEPOINT)
 
-            # Fill in id field of each record object
-            if serial:
-                last_id = self.get_last_value_of_last_sequence_used(cursor)
-                first_id = last_id - len(record_list) + 1
-                for record_index, record in enumerate(record_list):
-                    record.id = first_id + record_index
+                # Fill in id field of each record object
+                # NOTE: The records of split lists are filled in by the recursive calls
+                if serial:
+                    if id_list is None:
+                        last_id = self.get_last_value_of_last_sequence_used(cursor)
+                        id_list = range(last_id - len(record_list) + 1, last_id + 1)
+                    for record, record_id in zip(record_list, id_list):
+                        record.id = record_id
+
+    def copy_record_list(self, record_class, record_list, generate_id, serial):
+        """ Bulk loads a list of records of the same type into the database
+        
+        Backends supporting a faster bulk loading method override this.
+        
+        """
+        self.add_record_list(record_class, record_list, generate_id, serial)
 
     ### Update query helpers
 
@@ -530,6 +631,9 @@ class DatabaseAbstraction:
 
     def delete_record_list(self, record_class, record_or_id_list):
         """ Deletes a list of records from the database
+        
+        Accepts any iterable of records or IDs, including generators.
+        
         """
         if constants.DEBUG:
             assert issubclass(record_class, dblayer.backend.base.record.Record)
@@ -2,6 +2,7 @@
 """
 
 import datetime
+import functools
 
 import dblayer
 from dblayer import constants
@@ -702,10 +703,11 @@ def format_cross_join_group_list(clauses):
     return from_list
 
 
-def format_select(clauses, cache={}):
+@functools.lru_cache(maxsize=constants.SQL_CACHE_SIZE)
+def format_select(clauses):
     """ Formats a SELECT SQL statement with the given clauses
     
-    Returns (sql, parameter_tuple)
+    Returns the SQL statement. The most recently used ones are cached by their clauses.
     
     """
     if constants.DEBUG:
@@ -713,10 +715,6 @@ def format_select(clauses, cache={}):
         assert clauses.field_list, 'SQL SELECT statements must have a field list!'
         assert clauses.table_list, 'SQL SELECT statements must have source table(s) to select from!'
 
-    sql = cache.get(clauses)
-    if sql is not None:
-        return sql
-
     cross_join_group_list = format_cross_join_group_list(clauses)
 
     sql = [
@@ -743,17 +741,17 @@ def format_select(clauses, cache={}):
     if clauses.offset:
         sql.extend(('OFFSET', str(clauses.offset)))
 
-    sql = ' '.join(sql)
+    sql = ' '.join(sql) + ';'
     sql = replace_parameter_placeholders(sql)
 
-    cache[clauses] = sql
-    return sql + ';'
+    return sql
 
 
-def format_insert(clauses, cache={}):
+@functools.lru_cache(maxsize=constants.SQL_CACHE_SIZE)
+def format_insert(clauses):
     """ Formats a INSERT SQL statement with the given clauses
     
-    Returns (sql, parameter_tuple)
+    Returns the SQL statement. The most recently used ones are cached by their clauses.
     
     """
     if constants.DEBUG:
@@ -767,10 +765,6 @@ def format_insert(clauses, cache={}):
         assert not clauses.offset, 'SQL INSERT statements do not have an offset clause!'
         assert len(clauses.table_list) == 1, 'SQL INSERT statements can only work on a single table!'
 
-    sql = cache.get(clauses)
-    if sql is not None:
-        return sql
-
     sql = [
         'INSERT INTO',
         quote_name(clauses.table_list[0]),
@@ -781,14 +775,14 @@ def format_insert(clauses, cache={}):
     sql = ' '.join(sql) + ';'
     sql = replace_parameter_placeholders(sql)
 
-    cache[clauses] = sql
     return sql
 
 
-def format_update(clauses, cache={}):
+@functools.lru_cache(maxsize=constants.SQL_CACHE_SIZE)
+def format_update(clauses):
     """ Formats a UPDATE SQL statement with the given clauses
     
-    Returns (sql, parameter_tuple)
+    Returns the SQL statement. The most recently used ones are cached by their clauses.
     
     """
     if constants.DEBUG:
@@ -802,10 +796,6 @@ def format_update(clauses, cache={}):
         assert not clauses.offset, 'SQL UPDATE statements do not have an offset clause!'
         assert len(clauses.table_list) == 1, 'SQL UPDATE statements can only work on a single table!'
 
-    sql = cache.get(clauses)
-    if sql is not None:
-        return sql
-
     sql = [
         'UPDATE',
         quote_name(clauses.table_list[0]),
@@ -817,14 +807,14 @@ def format_update(clauses, cache={}):
     sql = ' '.join(sql) + ';'
     sql = replace_parameter_placeholders(sql)
 
-    cache[clauses] = sql
     return sql
 
 
-def format_delete(clauses, cache={}):
+@functools.lru_cache(maxsize=constants.SQL_CACHE_SIZE)
+def format_delete(clauses):
     """ Formats a DELETE SQL statement with the given clauses
     
-    Returns (sql, parameter_tuple)
+    Returns the SQL statement. The most recently used ones are cached by their clauses.
     
     """
     if constants.DEBUG:
@@ -838,10 +828,6 @@ def format_delete(clauses, cache={}):
         assert not clauses.offset, 'SQL DELETE statements do not have an offset clause!'
         assert len(clauses.table_list) == 1, 'SQL DELETE statements can only work on a single table!'
 
-    sql = cache.get(clauses)
-    if sql is not None:
-        return sql
-
     sql = [
         'DELETE FROM',
         quote_name(clauses.table_list[0]),
@@ -851,7 +837,6 @@ def format_delete(clauses, cache={}):
     sql = ' '.join(sql) + ';'
     sql = replace_parameter_placeholders(sql)
 
-    cache[clauses] = sql
     return sql
 
 
@@ -1365,9 +1350,6 @@ def format_query_condition(condition):
     tuples for each operator.
     
     """
-    if 0:
-        assert isinstance(condition, dblayer.model.query.Result)
-
     value_expression = format_expression(condition.expression)
 
     # Equals to a given value
@@ -1427,9 +1409,6 @@ def format_table_column_condition(column):
     tuples for each operator.
     
     """
-    if 0:
-        assert isinstance(condition, dblayer.model.query.BaseColumn)
-
     value_expression = format_expression(column)
 
     # Equals to a given value
@@ -14,6 +14,9 @@ class Record:
     # List of column names
     _column_name_list = ()
 
+    # List of the abstract SQL types of the columns in the same order
+    _column_type_list = ()
+
     # Set of names of nullable columns
     _nullable_column_name_set = set()
 
@@ -27,25 +30,43 @@ class Record:
 
     ### Textual representation for logging and debugging
 
+    # Short module name and class name used as the prefix of repr
+    # NOTE: Set by __init_subclass__ for each subclass
+    _repr_name = 'record.Record'
+
+    # (column name, default field value) pairs in column order
+    # NOTE: Fields having their default value are left out of the repr
+    # NOTE: Set by __init_subclass__ for each subclass
+    _repr_column_list = ()
+
+    def __init_subclass__(cls, **kwargs):
+        super().__init_subclass__(**kwargs)
+        cls._repr_name = '%s.%s' % (cls.__module__.rsplit('.', 1)[-1], cls.__name__)
+        cls._repr_column_list = tuple(
+            (name, cls._column_default_map.get(name))
+            for name in cls._column_name_list)
+
     def __repr__(self):
-        get_default_field_value = self._column_default_map.get
-        return '%s.%s(%s)' % (
-            self.__class__.__module__.rsplit('.', 1)[-1],
-            self.__class__.__name__,
+        return '%s(%s)' % (
+            self._repr_name,
             ', '.join(
-                '%s=%r' % (name, getattr(self, name))
-                for name in self._column_name_list
-                if getattr(self, name) is not get_default_field_value(name)))
+                '%s=%r' % (name, value)
+                for (name, default), value in zip(self._repr_column_list, self.tuple)
+                if value is not default))
 
     __str__ = __repr__
 
     def __eq__(self, other):
         if other.__class__ is not self.__class__:
             return False
-        for name in self._column_name_list:
-            if getattr(self, name) != getattr(other, name):
-                return False
-        return True
+        # The generated tuple property reads the slots directly
+        return self.tuple == other.tuple
+
+    @property
+    def tuple(self):
+        """ Returns a tuple with the field values of this record
+        """
+        return tuple(getattr(self, name) for name in self._column_name_list)
 
     def finalize(self):
         """ Finalizes the record
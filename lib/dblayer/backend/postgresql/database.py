@@ -1,15 +1,409 @@
+import collections
+import datetime
+import decimal
+import functools
+import io
+import itertools
+import re
+import threading
+
 import psycopg2
 import psycopg2.extensions
+import psycopg2.extras
+import psycopg2.pool
 
+import dblayer
+from dblayer import constants, util
 from dblayer.backend.base import database
 
 ### Force returning of unicode string from the database
 psycopg2.extensions.register_type(psycopg2.extensions.UNICODE)
 psycopg2.extensions.register_type(psycopg2.extensions.UNICODEARRAY)
 
+# Parameter placeholders and escaped percent signs in the SQL statements passed to psycopg2
+RX_PARAMETER_PLACEHOLDER = re.compile(r'%[%s]')
+
+# Range of the INTEGER type, the narrowest integer type of the columns
+INTEGER_RANGE = (-2 ** 31, 2 ** 31 - 1)
+
+# Statements changing the database structure
+RX_DDL_STATEMENT = re.compile(r'\s*(?:CREATE|DROP|ALTER)\b', re.IGNORECASE)
+
+
+def is_preparable_parameter(parameter):
+    """ Returns True if the parameter is converted without loss to any parameter type PREPARE can infer
+    
+    PREPARE infers the type of each parameter from the column it is compared with,
+    so a float would be rounded when compared with an integer column, a datetime
+    truncated when compared with a date column and an integer out of the range of
+    an INTEGER column would fail to convert. Booleans are accepted only as such.
+    
+    """
+    parameter_type = type(parameter)
+    if parameter_type is int:
+        return INTEGER_RANGE[0] <= parameter <= INTEGER_RANGE[1]
+    return parameter is None or parameter_type is str or parameter_type is bool
+
+
+def format_prepared_statement(sql):
+    """ Converts an SQL statement with psycopg2 parameter placeholders
+    to the body of a PREPARE statement using positional parameters
+    """
+    parameter_counter = itertools.count(1)
+    return RX_PARAMETER_PLACEHOLDER.sub(
+        lambda match: '%' if match.group() == '%%' else '$%d' % next(parameter_counter),
+        sql.rstrip().rstrip(';'))
+
+
+@functools.lru_cache(maxsize=constants.SQL_CACHE_SIZE)
+def format_update_from_values(quoted_table_name, quoted_column_name_list):
+    """ Formats an UPDATE statement for use with psycopg2.extras.execute_values
+    
+    It updates multiple rows matched by their primary key, which must be the
+    first column. The empty SELECT from the table before the VALUES list makes
+    the database server convert the values to the types of the table columns.
+    
+    """
+    quoted_primary_key_name = quoted_column_name_list[0]
+    return 'UPDATE %s AS t SET %s FROM (SELECT %s FROM %s WHERE FALSE UNION ALL VALUES %%s) AS v WHERE t.%s = v.%s' % (
+        quoted_table_name,
+        ', '.join('%s = v.%s' % (name, name) for name in quoted_column_name_list[1:]),
+        ', '.join(quoted_column_name_list),
+        quoted_table_name,
+        quoted_primary_key_name,
+        quoted_primary_key_name)
+
+
+# Escape sequences of the special characters in the text format of COPY
+COPY_ESCAPE_TABLE = str.maketrans({'\\': '\\\\', '\t': '\\t', '\n': '\\n', '\r': '\\r'})
+
+# Abstract SQL column types of the values format_copy_value can format
+COPY_COLUMN_TYPES = frozenset((
+    'PrimaryKey', 'ForeignKey', 'Boolean', 'Integer', 'Float', 'Decimal', 'Text', 'Date', 'Datetime'))
+
+
+def is_copy_supported(record_class):
+    """ Returns True if all the columns of the record class have types supported by COPY
+    """
+    column_type_list = record_class._column_type_list
+    return (
+        len(column_type_list) == len(record_class._column_name_list) and
+        COPY_COLUMN_TYPES.issuperset(column_type_list))
+
+
+def format_copy_value(value):
+    """ Formats a field value for the text format of COPY
+    
+    Raises TypeError on values it cannot format the same way as psycopg2 would
+    adapt them in INSERT statements, like time zone aware datetime values.
+    
+    """
+    if value is None:
+        return '\\N'
+    if isinstance(value, str):
+        return value.translate(COPY_ESCAPE_TABLE)
+    if isinstance(value, bool):
+        return 't' if value else 'f'
+    if isinstance(value, (int, float, decimal.Decimal)):
+        return str(value)
+    if isinstance(value, datetime.datetime):
+        if value.tzinfo is not None:
+            raise TypeError('Unsupported time zone aware datetime value for COPY: %r' % (value,))
+        return value.isoformat()
+    if isinstance(value, datetime.date):
+        return value.isoformat()
+    raise TypeError('Unsupported value type for COPY: %r' % (value,))
+
+
+# Connection pools by DSN, used only if CONNECTION_POOL_SIZE is not zero
+connection_pool_map = {}
+connection_pool_lock = threading.Lock()
+
+
+def get_connection_pool(dsn):
+    """ Returns the connection pool of the given DSN, creates it on first use
+    """
+    with connection_pool_lock:
+        connection_pool = connection_pool_map.get(dsn)
+        if connection_pool is None:
+            connection_pool = connection_pool_map[dsn] = psycopg2.pool.ThreadedConnectionPool(
+                0, constants.CONNECTION_POOL_SIZE, dsn)
+    return connection_pool
+
 
 class DatabaseAbstraction(database.DatabaseAbstraction):
 
+    # Names of the prepared statements on the current connection by their SQL statement
+    # in least recently used order, see execute_query
+    prepared_statement_map = None
+
+    # Pool the current connection was taken from or None if pooling is disabled
+    connection_pool = None
+
     def _connect(self, dsn, client_encoding='UTF8'):
-        self.connection = psycopg2.connect(dsn)
+        connection_pool = get_connection_pool(dsn) if constants.CONNECTION_POOL_SIZE else None
+        if connection_pool is not None:
+            try:
+                self.connection = connection_pool.getconn()
+            except psycopg2.pool.PoolError:
+                # All the pooled connections are in use, so open one outside of the pool
+                connection_pool = None
+            else:
+                self.connection.autocommit = False
+        if connection_pool is None:
+            self.connection = psycopg2.connect(dsn)
+        self.connection_pool = connection_pool
         self.connection.set_client_encoding(client_encoding)
+        self.prepared_statement_map = collections.OrderedDict()
+        self.prepared_statement_counter = itertools.count()
+
+    def close(self):
+        connection_pool = self.connection_pool
+        if connection_pool is not None:
+            self.connection_pool = None
+            connection = self.connection
+            self.connection = None
+            self.named_cursor_counter = None
+            if connection is not None:
+                # Reset the session state on both the server and the client side
+                # before the connection is reused, connections in a broken state
+                # are closed by the pool instead
+                try:
+                    connection.rollback()
+                    connection.autocommit = True
+                    with connection.cursor() as cursor:
+                        cursor.execute('DISCARD ALL')
+                    connection.set_session(
+                        isolation_level='DEFAULT', readonly='DEFAULT', deferrable='DEFAULT')
+                except psycopg2.Error:
+                    connection_pool.putconn(connection, close=True)
+                else:
+                    connection_pool.putconn(connection)
+
+        database.DatabaseAbstraction.close(self)
+        self.prepared_statement_map = None
+        self.prepared_statement_counter = None
+
+    def execute_statement_list(self, cursor, statement_list, ignore_errors=False):
+        # Changing the database structure can change the result types of
+        # the prepared statements, so all of them are dropped first
+        if self.prepared_statement_map and any(
+                RX_DDL_STATEMENT.match(sql) for sql, parameter_tuple in statement_list):
+            cursor.execute('DEALLOCATE ALL')
+            self.prepared_statement_map.clear()
+
+        database.DatabaseAbstraction.execute_statement_list(self, cursor, statement_list, ignore_errors)
+
+    def execute_query(self, cursor, sql, parameter_tuple=()):
+        """ Executes an SQL query on the given cursor as a prepared statement if possible
+        
+        SELECT statements are prepared on first use, so the database server parses and
+        plans them only once. Named (server side) cursors and statements with parameters
+        is_preparable_parameter does not accept (like the sequences of IN conditions,
+        floats, dates or big integers) are executed directly.
+        
+        NOTE: Prepared statements are not affected by rolling back transactions.
+        
+        """
+        if (not constants.PREPARED_STATEMENT_CACHE_SIZE or
+                cursor.name is not None or
+                not sql.startswith('SELECT') or
+                not all(map(is_preparable_parameter, parameter_tuple))):
+            cursor.execute(sql, parameter_tuple)
+            return
+
+        prepared_statement_map = self.prepared_statement_map
+        statement_name = prepared_statement_map.get(sql)
+        if statement_name is None:
+            statement_name = 'prepared_statement_%d' % next(self.prepared_statement_counter)
+            cursor.execute('PREPARE %s AS %s' % (statement_name, format_prepared_statement(sql)))
+            prepared_statement_map[sql] = statement_name
+
+            # Deallocate the least recently used prepared statement if there are too many
+            if len(prepared_statement_map) > constants.PREPARED_STATEMENT_CACHE_SIZE:
+                unused_sql, unused_statement_name = prepared_statement_map.popitem(last=False)
+                cursor.execute('DEALLOCATE %s' % unused_statement_name)
+        else:
+            prepared_statement_map.move_to_end(sql)
+
+        if parameter_tuple:
+            cursor.execute(
+                'EXECUTE %s (%s)' % (statement_name, ', '.join(['%s'] * len(parameter_tuple))),
+                parameter_tuple)
+        else:
+            cursor.execute('EXECUTE %s' % statement_name)
+
+    def executemany(self, cursor, sql, parameter_tuple_list):
+        """ Executes a single SQL statement on the given cursor for each parameter_tuple
+        
+        The statements are sent to the server in pages of constants.BATCH_PAGE_SIZE,
+        since psycopg2's executemany makes a round trip for each parameter_tuple.
+        
+        NOTE: It is not suitable to retrieve a result set, since the cursor
+              is closed right after executing the statement.
+        
+        """
+        if not parameter_tuple_list:
+            return
+
+        if constants.LOG_SQL_STATEMENTS:
+            util.log('SQL statement: executemany(%r, %r)', sql, parameter_tuple_list)
+
+        psycopg2.extras.execute_batch(
+            cursor, sql, parameter_tuple_list, page_size=constants.BATCH_PAGE_SIZE)
+
+    def execute_insert_many(self, cursor, sql, parameter_tuple_list, returning_id=False):
+        """ Executes a single row INSERT statement on the given cursor for each parameter_tuple
+        
+        The rows are inserted by multi-row INSERT statements of constants.BATCH_PAGE_SIZE
+        rows each, so the database server parses and plans a statement only once per page.
+        
+        The generated IDs are returned by the same statements if returning_id is true.
+        
+        """
+        if not parameter_tuple_list:
+            return [] if returning_id else None
+
+        if constants.LOG_SQL_STATEMENTS:
+            util.log('SQL statement: execute_insert_many(%r, %r)', sql, parameter_tuple_list)
+
+        # Split the statement before the row of parameter placeholders
+        sql, row_template = sql.rstrip().rstrip(';').rsplit(' VALUES ', 1)
+
+        if not returning_id:
+            psycopg2.extras.execute_values(
+                cursor, sql + ' VALUES %s', parameter_tuple_list,
+                template=row_template, page_size=constants.BATCH_PAGE_SIZE)
+            return None
+
+        row_list = psycopg2.extras.execute_values(
+            cursor, sql + ' VALUES %s RETURNING id', parameter_tuple_list,
+            template=row_template, page_size=constants.BATCH_PAGE_SIZE, fetch=True)
+        return [row[0] for row in row_list]
+
+    def update_record_list(self, record_class, record_list):
+        """ Updates a list of records already in the database
+        
+        All the records are updated by a single UPDATE statement joining the table with
+        the new field values, unless there is only one of them or some IDs are repeated.
+        
+        """
+        if constants.DEBUG:
+            assert issubclass(record_class, dblayer.backend.base.record.Record)
+
+        if len(record_list) < 2 or len({record.id for record in record_list}) < len(record_list):
+            database.DatabaseAbstraction.update_record_list(self, record_class, record_list)
+            return
+
+        for record in record_list:
+            if constants.DEBUG:
+                assert isinstance(record, record_class), 'Got record of unexpected type: %r' % (record,)
+                assert record.id is not None, 'Cannot update record which has not been added to the database!'
+            record.finalize()
+
+        sql = format_update_from_values(
+            self._format.quote_name(record_class._table_name),
+            record_class._quoted_column_name_list)
+
+        parameter_tuple_list = [record.tuple for record in record_list]
+
+        if constants.LOG_SQL_STATEMENTS:
+            util.log('SQL statement: update_record_list(%r, %r)', sql, parameter_tuple_list)
+
+        with self.cursor() as cursor:
+            psycopg2.extras.execute_values(
+                cursor, sql, parameter_tuple_list, page_size=constants.BATCH_PAGE_SIZE)
+
+    def delete_record_list(self, record_class, record_or_id_list):
+        """ Deletes a list of records from the database
+        
+        It is a single DELETE statement matching all the IDs passed as an array.
+        
+        """
+        if constants.DEBUG:
+            assert issubclass(record_class, dblayer.backend.base.record.Record)
+
+        id_list = [
+            record_or_id.id if isinstance(record_or_id, record_class) else record_or_id
+            for record_or_id in record_or_id_list]
+
+        if not id_list:
+            return
+
+        clauses = self.Clauses(
+            table_list=(record_class._table_name,),
+            where='id = ANY(?)')
+        sql = self._format.format_delete(clauses)
+
+        with self.cursor() as cursor:
+            self.execute(cursor, sql, (id_list,))
+
+    def add_record_list(self, record_class, record_list, generate_id, serial):
+        """ Inserts a list of records of the same type into the database
+        
+        Long lists of records with random IDs are loaded by COPY.
+        
+        """
+        if (not serial and
+                len(record_list) >= constants.COPY_MIN_RECORD_COUNT and
+                is_copy_supported(record_class)):
+            self.copy_record_list(record_class, record_list, generate_id, serial)
+        else:
+            database.DatabaseAbstraction.add_record_list(self, record_class, record_list, generate_id, serial)
+
+    def copy_record_list(self, record_class, record_list, generate_id, serial):
+        """ Inserts a list of records of the same type into the database using COPY
+        
+        The records are streamed to the server in the text format of COPY, which
+        is the fastest way to load many records. Falls back to INSERT statements
+        for tables with serial primary keys, since COPY cannot return the new IDs,
+        for column and value types format_copy_value does not support and on
+        integrity errors, like conflicting random IDs.
+        
+        """
+        if constants.DEBUG:
+            assert issubclass(record_class, dblayer.backend.base.record.Record)
+
+        if not record_list:
+            return
+
+        if serial or not is_copy_supported(record_class):
+            database.DatabaseAbstraction.add_record_list(self, record_class, record_list, generate_id, serial)
+            return
+
+        for record in record_list:
+            if constants.DEBUG:
+                assert isinstance(record, record_class), 'Got record of unexpected type: %r' % (record,)
+            record.finalize()
+            if generate_id:
+                record.id = util.get_random_id()
+            elif constants.DEBUG:
+                assert record.id, 'No record ID specified with ID generation disabled: %r' % record
+
+        try:
+            data = ''.join(
+                '\t'.join(map(format_copy_value, record.tuple)) + '\n'
+                for record in record_list)
+        except TypeError:
+            database.DatabaseAbstraction.add_record_list(self, record_class, record_list, generate_id, serial)
+            return
+
+        sql = 'COPY %s (%s) FROM STDIN' % (
+            self._format.quote_name(record_class._table_name),
+            ', '.join(record_class._quoted_column_name_list))
+
+        if constants.LOG_SQL_STATEMENTS:
+            util.log('SQL statement: copy_record_list(%r, %d records)', sql, len(record_list))
+
+        with self.cursor() as cursor:
+            try:
+                self.execute(cursor, self._SQL_IDENTITY_INSERT_SAVEPOINT)
+                cursor.copy_expert(sql, io.StringIO(data))
+            except self.IntegrityError:
+                self.execute(cursor, self._SQL_IDENTITY_INSERT_ROLLBACK_SAVEPOINT)
+            else:
+                self.execute(cursor, self._SQL_IDENTITY_INSERT_RELEASE_SAVEPOINT)
+                return
+
+        # Insert them with retrying on ID conflicts
+        database.DatabaseAbstraction.add_record_list(self, record_class, record_list, generate_id, serial)
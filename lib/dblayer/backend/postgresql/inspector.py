@@ -39,6 +39,9 @@ class ColumnInfo:
         for name in self.__slots__:
             setattr(self, name, row[name])
 
+        # The information schema reports nullability as 'YES' or 'NO'
+        self.is_nullable = self.is_nullable == 'YES'
+
     def __repr__(self):
         name_value_list = [(name, getattr(self, name)) for name in self.__slots__]
         return '%s(%s)' % (
@@ -123,19 +126,19 @@ ORDER BY table_name, ordinal_position;
 
         get_column_factory = self.COLUMN_FACTORY_MAP.get
 
-        table_class_map = {}
+        # Collect the class dictionaries first, since the table model classes
+        # are initialized right when they are created
+        class_dict_map = {}
         with self.cursor() as cursor:
             for row in self.execute_and_fetch_dict_iter(cursor, sql):
 
                 column_info = ColumnInfo()
                 column_info.load_information_schema(row)
 
-                table_class = table_class_map.get(column_info.table_name)
-                if table_class is None:
-                    class_name = str(self.convert_table_name_to_python(column_info.table_name))
-                    table_class = type(class_name, (table.Table,), {})
-                    table_class._table_name = column_info.table_name
-                    table_class_map[column_info.table_name] = table_class
+                class_dict = class_dict_map.get(column_info.table_name)
+                if class_dict is None:
+                    class_dict = class_dict_map[column_info.table_name] = dict(
+                        _table_name=column_info.table_name)
 
                 table_pk_columns = self.primary_key_columns.get(column_info.column_name, ())
                 if (column_info.column_name in self.primary_key_column_name_set or
@@ -153,9 +156,11 @@ ORDER BY table_name, ordinal_position;
                     continue
                 assert isinstance(column_definition, column.BaseColumn)
 
-                setattr(table_class, column_info.column_name, column_definition)
+                class_dict[column_info.column_name] = column_definition
 
-        return table_class_map.values()
+        return [
+            type(str(self.convert_table_name_to_python(table_name)), (table.Table,), class_dict)
+            for table_name, class_dict in class_dict_map.items()]
 
     def define_custom_column(self, column_info):
         assert isinstance(column_info, ColumnInfo)
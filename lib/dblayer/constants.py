@@ -2,6 +2,7 @@
 """
 
 import os
+import sys
 
 # Enables various sanity checks useful for development
 DEBUG = int(os.environ.get('DBLAYER_DEBUG', 0))
@@ -16,8 +17,37 @@ GENERATOR_TEMPLATE_DIRECTORY_PATH = os.path.join(
 # Range of database ID values (actual values are chosen randomly)
 DATABASE_ID_RANGE = (2 ** 62, 2 ** 63)
 
+# Number of random database IDs generated at once
+# NOTE: Each batch needs a single read from the random source of the operating system
+RANDOM_ID_BATCH_SIZE = 256
+
 # Number of rows should be loaded from the database at once
-CURSOR_ARRAYSIZE = 128
+# NOTE: Larger values need more memory per cursor, but far fewer round trips
+# to the database server while iterating over large result sets.
+CURSOR_ARRAYSIZE = int(os.environ.get('DBLAYER_CURSOR_ARRAYSIZE', 2048))
+
+# Number of parameter tuples sent to the database server in a single round trip
+# while executing the same statement for many rows (inserting a list of records)
+BATCH_PAGE_SIZE = int(os.environ.get('DBLAYER_BATCH_PAGE_SIZE', 1000))
+
+# Minimum number of records to insert with COPY instead of INSERT statements
+# NOTE: COPY bypasses the SQL parser, but has a higher fixed cost per call
+COPY_MIN_RECORD_COUNT = int(os.environ.get('DBLAYER_COPY_MIN_RECORD_COUNT', 64))
+
+# Maximum number of formatted SQL statements cached by their clauses
+SQL_CACHE_SIZE = 1024
+
+# Maximum number of pooled database connections for each DSN
+# NOTE: Closed connections are returned to the pool and reused by the next
+# connect to the same DSN, which saves the connection handshake. Any more
+# connections open at the same time are opened outside of the pool. Set it to
+# zero (the default) to disable pooling and close the connections for real.
+CONNECTION_POOL_SIZE = int(os.environ.get('DBLAYER_CONNECTION_POOL_SIZE', 0))
+
+# Maximum number of prepared statements kept on each database connection
+# NOTE: Frequently executed queries are parsed and planned by the database
+# server only once this way. Set it to zero to disable prepared statements.
+PREPARED_STATEMENT_CACHE_SIZE = 128
 
 # Logging
 LOG_SQL_STATEMENTS = DEBUG and True
@@ -32,9 +62,9 @@ PROFILE_QUERIES = DEBUG and True
 # Maximum number of retries on a failing single row INSERT query
 MAX_INSERT_RETRY_COUNT = 100
 
-# Join types
-INNER_JOIN = 'INNER JOIN'
-LEFT_JOIN = 'LEFT JOIN'
+# Join types (interned, since they are compared and used as keys frequently)
+INNER_JOIN = sys.intern('INNER JOIN')
+LEFT_JOIN = sys.intern('LEFT JOIN')
 JOIN_TYPES = (INNER_JOIN, LEFT_JOIN)
 
 
@@ -18,6 +18,22 @@ class GeneratorOptions:
     drop = True
 
 
+def get_template(cache=[]):
+    """ Returns the database abstraction template, loaded only once
+    
+    The template object caches its compiled code, so reusing it avoids
+    compiling the template again on each code generation.
+    
+    """
+    if not cache:
+        template = bottle.SimpleTemplate(
+            name='database',
+            lookup=[constants.GENERATOR_TEMPLATE_DIRECTORY_PATH],
+            noescape=True)
+        cache.append(template)
+    return cache[0]
+
+
 def generate(database, backend, abstraction_class_name, options=None):
     """ Generates database abstraction layer code for the given database
     model using the given database server specific backend module
@@ -29,14 +45,11 @@ def generate(database, backend, abstraction_class_name, options=None):
 
     format = __import__(backend.__name__, fromlist=('format',)).format
 
-    return ''.join(bottle.template(
-        'database',
-        template_lookup=[constants.GENERATOR_TEMPLATE_DIRECTORY_PATH],
-        template_settings=dict(noescape=True),
+    return get_template().render(
         constants=constants,
         database=database,
         backend=backend,
         options=options,
         format=format,
         abstraction_class_name=abstraction_class_name,
-        now=datetime.datetime.now()))
+        now=datetime.datetime.now())
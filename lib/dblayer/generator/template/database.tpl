@@ -52,6 +52,7 @@ class {{table.__class__.__name__}}Record(record.Record):
     # Column information
     _column_name_list = {{tuple(column.name for column in accessible_column_list)}}
     _quoted_column_name_list = {{tuple(format.quote_name(column.name) for column in accessible_column_list)}}
+    _column_type_list = {{tuple(column.abstract_sql_column_type for column in accessible_column_list)}}
     _nullable_column_name_set = set({{tuple(column.name for column in accessible_column_list)}})
     _column_default_map = {{dict((column.name, column.default) for column in accessible_column_list if column.default is not None and not column.has_custom_default)}}
     
@@ -97,8 +98,9 @@ class {{table.__class__.__name__}}Record(record.Record):
     def dict(self):
         """ Returns a dictionary with the field values of this {{table.__class__.__name__}} record
         """
-        return dict(
-            {{',\n            '.join('%s=self.%s' % (column.name, column.name) for column in accessible_column_list)}})
+        return {
+            {{',\n            '.join('%r: self.%s' % (column.name, column.name) for column in accessible_column_list)}}
+        }
 
 %end
 ### Database abstraction
@@ -382,9 +384,7 @@ class {{abstraction_class_name}}(database.DatabaseAbstraction):
             %if constants.PROFILE_QUERIES:
             start_time = time.time()
             %end
-            record_list = [
-                record_class(*row) 
-                for row in self.execute_and_fetch_iter(cursor, sql, parameter_tuple)]
+            record_list = self.execute_and_fetch_record_list(cursor, record_class, sql, parameter_tuple)
             %if constants.PROFILE_QUERIES:
             end_time = time.time()
             util.log('Query execution time: %dms', int((end_time - start_time) * 1000 + 0.5))
@@ -435,14 +435,12 @@ class {{abstraction_class_name}}(database.DatabaseAbstraction):
         %end
             %if constants.PROFILE_QUERIES:
             start_time = time.time()
-            row_list = list(self.execute_and_fetch_iter(cursor, sql, parameter_tuple))
+            record_list = self.execute_and_fetch_record_list(cursor, record_class, sql, parameter_tuple)
             end_time = time.time()
             util.log('Query execution time: %dms', int((end_time - start_time) * 1000 + 0.5))
-            for row in row_list:
-                yield record_class(*row)
+            yield from record_list
             %else:
-            for row in self.execute_and_fetch_iter(cursor, sql, parameter_tuple):
-                yield record_class(*row)
+            yield from self.execute_and_fetch_record_iter(cursor, record_class, sql, parameter_tuple)
             %end
             
     def find_{{table_name}}_count(
@@ -589,9 +587,7 @@ class {{abstraction_class_name}}(database.DatabaseAbstraction):
             %if constants.PROFILE_QUERIES:
             start_time = time.time()
             %end
-            record_list = [
-                record_class(*row) 
-                for row in self.execute_and_fetch_iter(cursor, sql, parameter_tuple)]
+            record_list = self.execute_and_fetch_record_list(cursor, record_class, sql, parameter_tuple)
             %if constants.PROFILE_QUERIES:
             end_time = time.time()
             util.log('Query execution time: %dms', int((end_time - start_time) * 1000 + 0.5))
@@ -643,14 +639,12 @@ class {{abstraction_class_name}}(database.DatabaseAbstraction):
         %end
             %if constants.PROFILE_QUERIES:
             start_time = time.time()
-            row_list = list(self.execute_and_fetch_iter(cursor, sql, parameter_tuple))
+            record_list = self.execute_and_fetch_record_list(cursor, record_class, sql, parameter_tuple)
             end_time = time.time()
             util.log('Query execution time: %dms', int((end_time - start_time) * 1000 + 0.5))
-            for row in row_list:
-                yield record_class(*row)
+            yield from record_list
             %else:
-            for row in self.execute_and_fetch_iter(cursor, sql, parameter_tuple):
-                yield record_class(*row)
+            yield from self.execute_and_fetch_record_iter(cursor, record_class, sql, parameter_tuple)
             %end
             
     def query_{{query_name}}_count(
@@ -725,6 +719,11 @@ class {{abstraction_class_name}}(database.DatabaseAbstraction):
         """
         self.add_record_list(self.new_{{table._name}}, record_list, generate_id, {{repr(table._primary_key.serial)}})
         
+    def copy_{{table._name}}_list(self, record_list, generate_id=True):
+        """ Bulk loads multiple {{table.__class__.__name__}} records into the {{table._name}} database table
+        """
+        self.copy_record_list(self.new_{{table._name}}, record_list, generate_id, {{repr(table._primary_key.serial)}})
+        
     %end
     %end
     %end
@@ -6,7 +6,7 @@ Requires the NetworkX library: http://networkx.lanl.gov/
 
 import networkx
 
-from dblayer.model import database, table as table_model, column as column_model
+from dblayer.model import database, column as column_model
 
 
 class GMLExporter:
@@ -23,25 +23,23 @@ class GMLExporter:
         g = networkx.MultiDiGraph()
 
         for table in model._table_list:
-            if 0:
-                assert isinstance(table, table_model.Table)
-            title = table._name.upper()
-            column_label_list = [
+            # NOTE: Joining a list is faster than joining a generator expression,
+            # since str.join would build a list from the generator anyway
+            column_labels = '\n'.join([
                 '%s:%s%s%s' % (
                     column.name,
-                    column.__class__.__name__,
+                    column._class_name,
                     ' NULL' if column.null else '',
                     '->' if isinstance(column, column_model.ForeignKey) else '')
-                for column in table._column_list]
-            label = '%s\n\n%s' % (title, '\n'.join(column_label_list))
+                for column in table._column_list])
+            label = '%s\n\n%s' % (table._name.upper(), column_labels)
             g.add_node(id(table), label=label)
 
-        for table in model._table_list:
-            for fk_column in table._column_list:
-                if isinstance(fk_column, column_model.ForeignKey):
-                    g.add_edge(
-                        id(table),
-                        id(fk_column.referenced_table),
-                        label=fk_column.name)
+        edge_list = [
+            (id(table), id(fk_column.referenced_table), dict(label=fk_column.name))
+            for table in model._table_list
+            for fk_column in table._column_list
+            if isinstance(fk_column, column_model.ForeignKey)]
+        g.add_edges_from(edge_list)
 
         networkx.write_gml(g, filepath)
@@ -1,6 +1,8 @@
 """ Aggregate functions can be used in to aggregate data in queries
 """
 
+from dblayer import constants
+
 from dblayer.model import function
 
 
@@ -8,28 +10,31 @@ class BaseAggregate(function.BaseFunction):
     """ Base class for aggregates
     """
 
+    __slots__ = ()
+
     def __init__(self, *args):
-        function.BaseFunction.__init__(self, *args)
+        if constants.DEBUG:
+            assert self.__class__ is not BaseAggregate, (
+                'Only subclasses of BaseAggregate can be instantiated!')
 
-        assert self.__class__ is not BaseAggregate, (
-            'Only subclasses of BaseAggregate can be instantiated!')
+        function.BaseFunction.__init__(self, *args)
 
 
 class Count(BaseAggregate):
-    pass
+    __slots__ = ()
 
 
 class Min(BaseAggregate):
-    pass
+    __slots__ = ()
 
 
 class Max(BaseAggregate):
-    pass
+    __slots__ = ()
 
 
 class Sum(BaseAggregate):
-    pass
+    __slots__ = ()
 
 
 class Avg(BaseAggregate):
-    pass
+    __slots__ = ()
@@ -4,7 +4,7 @@
 import inspect
 import types
 
-from dblayer import util
+from dblayer import util, constants
 
 from dblayer.model import index, function, constraint
 
@@ -20,7 +20,8 @@ class BaseColumn:
     abstract_sql_column_type = None
 
     # Reference to the table class containing this column
-    # NOTE: Set by __new__ of the table definition class
+    # NOTE: Set by initialize of the table or query definition class,
+    # called by Table.__init_subclass__ right after the class definition
     table_class = None
 
     # Reference to the table instance containing this column or None for model columns
@@ -28,7 +29,8 @@ class BaseColumn:
     table = None
 
     # Name of the column
-    # NOTE: Set by __new__ of the table definition class
+    # NOTE: Set by initialize of the table or query definition class,
+    # called by Table.__init_subclass__ right after the class definition
     name = ''
 
     # Makrs the primary key column
@@ -53,11 +55,18 @@ class BaseColumn:
     # Exclude these parameters from full repr formatting
     full_repr_exclude = ()
 
-    @staticmethod
-    def sort_key(obj):
-        """ Sort key to preserve the lexical definition order
-        """
-        return obj.__definition_serial__
+    # Name of the column class
+    # NOTE: Set by __init_subclass__ for each subclass
+    _class_name = 'BaseColumn'
+
+    # Short module name and class name used as the prefix of repr
+    # NOTE: Set by __init_subclass__ for each subclass
+    _repr_name = 'column.BaseColumn'
+
+    def __init_subclass__(cls, **kwargs):
+        super().__init_subclass__(**kwargs)
+        cls._class_name = cls.__name__
+        cls._repr_name = '%s.%s' % (cls.__module__.rsplit('.', 1)[-1], cls.__name__)
 
     @property
     def has_custom_default(self):
@@ -91,6 +100,10 @@ class BaseColumn:
 
     def full_repr(self):
         """ Gives the full representation, only for use with class level column definitions
+        
+        References to the table class containing the column are formatted as None,
+        since that class is not defined yet while its body is executed.
+        
         """
         fullargspec = inspect.getfullargspec(self.__init__)
         args = fullargspec.args
@@ -106,8 +119,13 @@ class BaseColumn:
             if name in self.full_repr_exclude:
                 continue
             value = getattr(self, name)
+            if value is not None and value is self.table_class:
+                value = None
             if type(value) == class_type:
                 formatted_argument_list.append('%s' % value.__name__)
+            elif isinstance(value, BaseColumn) and value.table is not None:
+                # Column of a table instance, like the source tables of queries by alias name
+                formatted_argument_list.append(repr(value))
             elif isinstance(value, BaseColumn) and value.table_class is not self.__class__:
                 formatted_argument_list.append(
                     '%s.%s' % (value.table_class.__name__, value.name))
@@ -119,20 +137,21 @@ class BaseColumn:
             if name in self.full_repr_exclude:
                 continue
             value = getattr(self, name)
+            if value is not None and value is self.table_class:
+                value = None
             if value == default:
                 continue
             if type(value) == class_type:
                 formatted_argument_list.append('%s=%s' % (name, value.__name__))
+            elif isinstance(value, BaseColumn) and value.table is not None:
+                formatted_argument_list.append('%s=%r' % (name, value))
             elif isinstance(value, BaseColumn) and value.table_class is not self.__class__:
                 formatted_argument_list.append(
                     '%s=%s.%s' % (name, value.table_class.__name__, value.name))
             else:
                 formatted_argument_list.append('%s=%r' % (name, value))
 
-        return '%s.%s(%s)' % (
-            self.__class__.__module__.rsplit('.', 1)[-1],
-            self.__class__.__name__,
-            ', '.join(formatted_argument_list))
+        return '%s(%s)' % (self._repr_name, ', '.join(formatted_argument_list))
 
     def clone(self, table):
         """ Clone this column for a table instance
@@ -140,17 +159,20 @@ class BaseColumn:
         NOTE: It is called by Table.__init__ to bound the columns to the table instance.
         
         """
-        clone = self.__class__()
+        clone = object.__new__(self.__class__)
         clone.__dict__.update(self.__dict__)
         clone.table = table
         return clone
 
     def get_implicit_definition_list_for_table_class(self, table_class):
-        """ Returns list of (name, definition) tuples for the implicit definitions
+        """ Returns a sequence of (name, definition) tuples for the implicit definitions
         required on the table model class level
         
+        It is an empty tuple if no implicit definitions are required. The results
+        are not cached, since the implicit definitions are bound to a single table.
+        
         """
-        return []
+        return ()
 
 
 class Custom(BaseColumn):
@@ -160,9 +182,11 @@ class Custom(BaseColumn):
     abstract_sql_column_type = 'Custom'
 
     def __init__(self, sql_type=None, default=None, null=False, doc=None):
+        if constants.DEBUG:
+            assert isinstance(null, bool)
         self.sql_type = sql_type
         self.default = default
-        self.null = bool(null)
+        self.null = null
         BaseColumn.__init__(self, doc)
 
 
@@ -174,8 +198,11 @@ class PrimaryKey(BaseColumn):
     primary_key = True
 
     def __init__(self, serial=False, implicit=True, doc=None):
-        self.serial = bool(serial)
-        self.implicit = bool(implicit)
+        if constants.DEBUG:
+            assert isinstance(serial, bool)
+            assert isinstance(implicit, bool)
+        self.serial = serial
+        self.implicit = implicit
         BaseColumn.__init__(self, doc)
 
         # Move the primary key fields to the top of the column list
@@ -183,7 +210,7 @@ class PrimaryKey(BaseColumn):
 
     def get_implicit_definition_list_for_table_class(self, table_class):
         if self.serial or not self.implicit:
-            return []
+            return ()
         return [('pk_%s' % self.name, constraint.PrimaryKey(self))]
 
 
@@ -196,21 +223,44 @@ class ForeignKey(BaseColumn):
     # Definition of the referenced table
     referenced_table_class = None
 
-    # Referenced table instance, filled in by Database.__init__ after
-    # creating all the database model objects
-    referenced_table = None
+    # Referenced table instance once resolved, see the referenced_table property
+    _referenced_table = None
 
     def __init__(self, referenced_table_class=None, default=None, null=False, implicit=True, doc=None):
+        if constants.DEBUG:
+            assert isinstance(null, bool)
+            assert isinstance(implicit, bool)
         # NOTE: The referenced table class can be set to None and filled later
         self.referenced_table_class = referenced_table_class
         self.default = default
-        self.null = bool(null)
-        self.implicit = bool(implicit)
+        self.null = null
+        self.implicit = implicit
         BaseColumn.__init__(self, doc)
 
+    @property
+    def referenced_table(self):
+        """ Referenced table instance
+        
+        It is looked up in the database model on first access, since all the
+        tables must be bound to the database model first. It is None for
+        foreign keys of tables not bound to a database model.
+        
+        """
+        referenced_table = self._referenced_table
+        if referenced_table is None:
+            if self.table is None or self.table._database_class is None:
+                return None
+            referenced_table = self.table._database_class._table_map.get(
+                self.referenced_table_class.__name__)
+            assert referenced_table, (
+                    'Could not find referenced database table for foreign key: %s.%s' %
+                    (self.table.__class__.__name__, self.name))
+            self._referenced_table = referenced_table
+        return referenced_table
+
     def get_implicit_definition_list_for_table_class(self, table_class):
         if not self.implicit:
-            return []
+            return ()
         return [('fk_%s' % self.name, constraint.ForeignKey(self))]
 
 
@@ -221,8 +271,10 @@ class Boolean(BaseColumn):
     abstract_sql_column_type = 'Boolean'
 
     def __init__(self, default=None, null=False, doc=None):
+        if constants.DEBUG:
+            assert isinstance(null, bool)
         self.default = default
-        self.null = bool(null)
+        self.null = null
         BaseColumn.__init__(self, doc)
 
 
@@ -236,9 +288,12 @@ class Integer(BaseColumn):
     digits = None
 
     def __init__(self, digits=None, default=None, null=False, doc=None):
-        self.digits = int(digits) if digits else None
+        if constants.DEBUG:
+            assert digits is None or isinstance(digits, int)
+            assert isinstance(null, bool)
+        self.digits = digits or None
         self.default = default
-        self.null = bool(null)
+        self.null = null
         BaseColumn.__init__(self, doc)
 
 
@@ -252,9 +307,12 @@ class Float(BaseColumn):
     size = None
 
     def __init__(self, double=True, default=None, null=False, doc=None):
-        self.double = bool(double)
+        if constants.DEBUG:
+            assert isinstance(double, bool)
+            assert isinstance(null, bool)
+        self.double = double
         self.default = default
-        self.null = bool(null)
+        self.null = null
         BaseColumn.__init__(self, doc)
 
 
@@ -271,10 +329,14 @@ class Decimal(BaseColumn):
     scale = None
 
     def __init__(self, precision=None, scale=None, default=None, null=False, doc=None):
-        self.precision = None if precision is None else int(precision)
-        self.scale = None if scale is None else int(scale)
+        if constants.DEBUG:
+            assert precision is None or isinstance(precision, int)
+            assert scale is None or isinstance(scale, int)
+            assert isinstance(null, bool)
+        self.precision = precision
+        self.scale = scale
         self.default = default
-        self.null = bool(null)
+        self.null = null
         BaseColumn.__init__(self, doc)
 
 
@@ -288,9 +350,12 @@ class Text(BaseColumn):
     maxlength = None
 
     def __init__(self, maxlength=None, default=None, null=False, doc=None):
-        self.maxlength = int(maxlength) if maxlength else None
+        if constants.DEBUG:
+            assert maxlength is None or isinstance(maxlength, int)
+            assert isinstance(null, bool)
+        self.maxlength = maxlength or None
         self.default = default
-        self.null = bool(null)
+        self.null = null
         BaseColumn.__init__(self, doc)
 
 
@@ -301,8 +366,10 @@ class Date(BaseColumn):
     abstract_sql_column_type = 'Date'
 
     def __init__(self, default=None, null=False, doc=None):
+        if constants.DEBUG:
+            assert isinstance(null, bool)
         self.default = default
-        self.null = bool(null)
+        self.null = null
         BaseColumn.__init__(self, doc)
 
 
@@ -313,8 +380,10 @@ class Datetime(BaseColumn):
     abstract_sql_column_type = 'Datetime'
 
     def __init__(self, default=None, null=False, doc=None):
+        if constants.DEBUG:
+            assert isinstance(null, bool)
         self.default = default
-        self.null = bool(null)
+        self.null = null
         BaseColumn.__init__(self, doc)
 
 
@@ -334,13 +403,15 @@ class SearchDocument(BaseColumn):
     expression = None
 
     def __init__(self, expression=None, implicit=True, doc=None):
+        if constants.DEBUG:
+            assert isinstance(implicit, bool)
         self.expression = expression
         self.null = False
-        self.implicit = bool(implicit)
+        self.implicit = implicit
         BaseColumn.__init__(self, doc=doc)
 
     def get_implicit_definition_list_for_table_class(self, table_class):
         if not self.implicit:
-            return []
+            return ()
         assert self.expression, 'Expression to build up the search document must be given!'
         return [(self.name + '_index', index.FullTextSearchIndex(*self.expression))]
@@ -12,7 +12,8 @@ class BaseConstraint:
     __definition_serial__ = 0
 
     # Reference to the table class containing this constraint
-    # NOTE: Set by __new__ of the table definition class
+    # NOTE: Set by Table.initialize, called by Table.__init_subclass__
+    # right after the table class definition
     table_class = None
 
     # Reference to the table instance containing this constraint or None for model constraints
@@ -20,15 +21,20 @@ class BaseConstraint:
     table = None
 
     # Name of the constraint
-    # NOTE: Set by __new__ of the table definition class
+    # NOTE: Set by Table.initialize, called by Table.__init_subclass__
+    # right after the table class definition
     name = ''
 
     # Indicates that this model object is added implicitly by some other model object
     implicit = False
 
-    @staticmethod
-    def sort_key(obj):
-        return obj.__definition_serial__
+    # Short module name and class name used as the prefix of repr
+    # NOTE: Set by __init_subclass__ for each subclass
+    _repr_name = 'constraint.BaseConstraint'
+
+    def __init_subclass__(cls, **kwargs):
+        super().__init_subclass__(**kwargs)
+        cls._repr_name = '%s.%s' % (cls.__module__.rsplit('.', 1)[-1], cls.__name__)
 
     def __init__(self):
         assert self.__class__ is not BaseConstraint, (
@@ -44,9 +50,7 @@ class BaseConstraint:
             self.name)
 
     def __repr__(self):
-        return '%s.%s()' % (
-            self.__class__.__module__.rsplit('.', 1)[-1],
-            self.__class__.__name__)
+        return '%s()' % self._repr_name
 
     def clone(self, table):
         """ Clone this constraint for a table instance
@@ -54,7 +58,7 @@ class BaseConstraint:
         NOTE: It is called by Table.__init__ to bound the constraints to the table instance.
         
         """
-        clone = self.__class__(None)
+        clone = object.__new__(self.__class__)
         clone.__dict__.update(self.__dict__)
         clone.table = table
         return clone
@@ -83,9 +87,8 @@ class BaseColumnConstraint(BaseConstraint):
             tuple(column.name for column in self.columns))
 
     def __repr__(self):
-        return '%s.%s(%s)' % (
-            self.__class__.__module__.rsplit('.', 1)[-1],
-            self.__class__.__name__,
+        return '%s(%s)' % (
+            self._repr_name,
             ', '.join(column.name for column in self.columns))
 
     def clone(self, table):
@@ -118,7 +121,4 @@ class Check(BaseConstraint):
         self.expression = expression
 
     def __repr__(self):
-        return '%s.%s(%r)' % (
-            self.__class__.__module__.rsplit('.', 1)[-1],
-            self.__class__.__name__,
-            self.expression)
+        return '%s(%r)' % (self._repr_name, self.expression)
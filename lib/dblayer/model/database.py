@@ -8,8 +8,11 @@ or schema.
 
 """
 
+import collections
+
+from dblayer import util
 from dblayer.generator import generator
-from dblayer.model import table, column, procedure
+from dblayer.model import table, procedure
 
 
 class Database:
@@ -17,6 +20,8 @@ class Database:
     """
 
     # Flag indicating that the model has been initialized
+    # NOTE: Looked up in the own __dict__ of each model class only, so
+    # subclasses of an initialized model class are still initialized
     _initialized = False
 
     # List of initialized table models in the database
@@ -25,12 +30,27 @@ class Database:
     # List of initialized stored procedure definitions in the database
     _procedure_list = ()
 
+    # Mapping of table class names to the initialized table models in the database,
+    # used to resolve the tables referenced by foreign keys
+    _table_map = None
+
     # Name of the abstraction layer class
     _abstraction_class_name = ''
 
+    # Source code formatted by pretty_format_class, cached per model class
+    _pretty_formatted_source = None
+
+    # Short module name and class name used as the prefix of repr
+    # NOTE: Set by __init_subclass__ for each subclass
+    _repr_name = 'database.Database'
+
+    def __init_subclass__(cls, **kwargs):
+        super().__init_subclass__(**kwargs)
+        cls._repr_name = '%s.%s' % (cls.__module__.rsplit('.', 1)[-1], cls.__name__)
+
     def __new__(cls, *args, **kws):
         # Initialize the class only once
-        if not cls._initialized:
+        if '_initialized' not in cls.__dict__:
             cls.initialize()
 
         return super(Database, cls).__new__(cls)
@@ -44,8 +64,11 @@ class Database:
         # Assign name to tables and collect them
         cls._table_list = []
         cls._procedure_list = []
-        for name in dir(cls):
-            value = getattr(cls, name)
+        for name, value in util.get_class_attribute_items(cls):
+
+            # Model definitions never have private names
+            if name.startswith('_'):
+                continue
 
             if isinstance(value, table.Table):
                 assert value._database_class is None, 'Table already bound to a database class!'
@@ -59,24 +82,24 @@ class Database:
                 value.database_class = cls
                 cls._procedure_list.append(value)
 
-        # Sort them by definition order
-        cls._table_list.sort(key=table.Table._sort_key)
-        cls._procedure_list.sort(key=procedure.Procedure.sort_key)
+        # Sort the procedures by definition order
+        # NOTE: The tables are already in definition order, since
+        # class dictionaries preserve the order of their items
+        cls._procedure_list.sort(key=util.definition_order_key)
 
-        # Connect all foreign keys by looking up the referenced tables
-        table_map = dict(
-            (table_instance.__class__.__name__, table_instance)
-            for table_instance in cls._table_list)
+        # Map the tables by class name, so foreign keys can look up the referenced tables
+        # NOTE: The foreign keys resolve their referenced table only on first access
+        table_map = {
+            table_instance.__class__.__name__: table_instance
+            for table_instance in cls._table_list}
         assert len(table_map) == len(cls._table_list), (
-            'Some of the table classes were used more than once to construct the database model!')
-        for table_instance in cls._table_list:
-            for fk_column in table_instance._column_list:
-                if isinstance(fk_column, column.ForeignKey):
-                    referenced_table = table_map.get(fk_column.referenced_table_class.__name__)
-                    assert referenced_table, (
-                            'Could not find referenced database table for foreign key: %s.%s' %
-                            (table_instance.__class__.__name__, fk_column.name))
-                    fk_column.referenced_table = referenced_table
+            'Some of the table classes were used more than once to construct the database model: %s' %
+            ', '.join(sorted(
+                name for name, count in collections.Counter(
+                    table_instance.__class__.__name__
+                    for table_instance in cls._table_list).items()
+                if count > 1)))
+        cls._table_map = table_map
 
     def __init__(self, abstraction_class_name):
         self._abstraction_class_name = abstraction_class_name
@@ -85,10 +108,7 @@ class Database:
         return '<%s Database>' % self.__class__.__name__
 
     def __repr__(self):
-        return '%s.%s(%r)' % (
-            self.__class__.__module__.rsplit('.', 1)[-1],
-            self.__class__.__name__,
-            self._abstraction_class_name)
+        return '%s(%r)' % (self._repr_name, self._abstraction_class_name)
 
     def generate(self, backend, options=None):
         """ Generate database abstraction layer module for use with the given
@@ -101,9 +121,14 @@ class Database:
         """ Formats source code defining the database model, including all the tables used in it
         """
         # Initialize the class only once
-        if not cls._initialized:
+        if '_initialized' not in cls.__dict__:
             cls.initialize()
 
+        # The source is formatted only once for each model class
+        source = cls.__dict__.get('_pretty_formatted_source')
+        if source is not None:
+            return source
+
         line_list = '''\
 import dblayer
 import dblayer.backend.postgresql
@@ -111,11 +136,12 @@ from dblayer.model import database, table, query
 from dblayer.model import column, index, constraint, aggregate, function, trigger, procedure
 '''.split('\n')
         append_line = line_list.append
+        extend_lines = line_list.extend
 
+        # NOTE: The table and procedure lists contain only objects of the right
+        # type, since they are collected by type checks in initialize
         for obj in cls._table_list:
-            assert isinstance(obj, table.Table)
-            append_line(obj.__class__.pretty_format_class())
-            append_line('')
+            extend_lines((obj.__class__.pretty_format_class(), ''))
 
         append_line('class %s(database.Database):' % cls.__name__)
 
@@ -127,12 +153,13 @@ from dblayer.model import column, index, constraint, aggregate, function, trigge
         else:
             append_line('')
 
-        for obj in cls._table_list:
-            assert isinstance(obj, table.Table)
-            append_line('    %s = %s()' % (obj._name, obj.__class__.__name__))
+        extend_lines(
+            '    %s = %s()' % (obj._name, obj.__class__.__name__)
+            for obj in cls._table_list)
 
-        for obj in cls._procedure_list:
-            assert isinstance(obj, procedure.Procedure)
-            append_line('    %s = %r' % (obj.name, obj))
+        extend_lines(
+            '    %s = %r' % (obj.name, obj)
+            for obj in cls._procedure_list)
 
-        return '\n'.join(line_list)
+        cls._pretty_formatted_source = source = '\n'.join(line_list)
+        return source
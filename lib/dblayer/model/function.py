@@ -1,25 +1,37 @@
 """ Functions can be used in result expressions of queries
 """
 
+from dblayer import constants
+
 
 class BaseFunction:
     """ Base class for functions
     """
 
+    __slots__ = (
+        # Tuple of the arguments passed to the function
+        'args',)
+
+    # Short module name and class name used as the prefix of repr
+    # NOTE: Set by __init_subclass__ for each subclass
+    _repr_name = 'function.BaseFunction'
+
+    def __init_subclass__(cls, **kwargs):
+        super().__init_subclass__(**kwargs)
+        cls._repr_name = '%s.%s' % (cls.__module__.rsplit('.', 1)[-1], cls.__name__)
+
     def __init__(self, *args):
-        self.args = args
+        if constants.DEBUG:
+            assert self.__class__ is not BaseFunction, (
+                'Only subclasses of BaseFunction can be instantiated!')
 
-        assert self.__class__ is not BaseFunction, (
-            'Only subclasses of BaseFunction can be instantiated!')
+        self.args = args
 
     def __str__(self):
         return '<%s%r>' % (self.__class__.__name__, tuple(self.args))
 
     def __repr__(self):
-        return '%s.%s(%s)' % (
-            self.__class__.__module__.rsplit('.', 1)[-1],
-            self.__class__.__name__,
-            ', '.join(map(repr, self.args)))
+        return '%s(%s)' % (self._repr_name, ', '.join(map(repr, self.args)))
 
 
 ### Custom
@@ -31,6 +43,8 @@ class Custom(BaseFunction):
     
     """
 
+    __slots__ = ()
+
 
 ### Variable
 
@@ -42,6 +56,8 @@ class Var(BaseFunction):
     
     """
 
+    __slots__ = ()
+
 
 ### Logical
 
@@ -52,6 +68,8 @@ class Not(BaseFunction):
     
     """
 
+    __slots__ = ()
+
     def __init__(self, a):
         BaseFunction.__init__(self, a)
 
@@ -63,6 +81,8 @@ class And(BaseFunction):
     
     """
 
+    __slots__ = ()
+
 
 class Or(BaseFunction):
     """ Logical OR of its parameters
@@ -71,6 +91,8 @@ class Or(BaseFunction):
     
     """
 
+    __slots__ = ()
+
 
 ### Comparision
 
@@ -81,6 +103,8 @@ class Equal(BaseFunction):
     
     """
 
+    __slots__ = ()
+
     def __init__(self, a, b):
         BaseFunction.__init__(self, a, b)
 
@@ -92,6 +116,8 @@ class NotEqual(BaseFunction):
     
     """
 
+    __slots__ = ()
+
     def __init__(self, a, b):
         BaseFunction.__init__(self, a, b)
 
@@ -103,6 +129,8 @@ class LessThan(BaseFunction):
     
     """
 
+    __slots__ = ()
+
     def __init__(self, a, b):
         BaseFunction.__init__(self, a, b)
 
@@ -114,6 +142,8 @@ class LessThanOrEqual(BaseFunction):
     
     """
 
+    __slots__ = ()
+
     def __init__(self, a, b):
         BaseFunction.__init__(self, a, b)
 
@@ -125,6 +155,8 @@ class GreaterThan(BaseFunction):
     
     """
 
+    __slots__ = ()
+
     def __init__(self, a, b):
         BaseFunction.__init__(self, a, b)
 
@@ -136,6 +168,8 @@ class GreaterThanOrEqual(BaseFunction):
     
     """
 
+    __slots__ = ()
+
     def __init__(self, a, b):
         BaseFunction.__init__(self, a, b)
 
@@ -147,6 +181,8 @@ class In(BaseFunction):
     
     """
 
+    __slots__ = ()
+
     def __init__(self, a, b):
         BaseFunction.__init__(self, a, b)
 
@@ -158,6 +194,8 @@ class NotIn(BaseFunction):
     
     """
 
+    __slots__ = ()
+
     def __init__(self, a, b):
         BaseFunction.__init__(self, a, b)
 
@@ -168,6 +206,8 @@ class Neg(BaseFunction):
     """ Negate a single numeric value
     """
 
+    __slots__ = ()
+
     def __init__(self, a):
         BaseFunction.__init__(self, a)
 
@@ -176,21 +216,29 @@ class Add(BaseFunction):
     """ Add any number of numeric values
     """
 
+    __slots__ = ()
+
 
 class Sub(BaseFunction):
     """ Subtract any number of numeric values from the first one
     """
 
+    __slots__ = ()
+
 
 class Mul(BaseFunction):
     """ Multiply any number of numeric values
     """
 
+    __slots__ = ()
+
 
 class Div(BaseFunction):
     """ Divide the first numeric value with the subsequent ones
     """
 
+    __slots__ = ()
+
 
 # TODO: Pow, Exp, Log, ...
 
@@ -203,6 +251,8 @@ class Concat(BaseFunction):
     
     """
 
+    __slots__ = ()
+
 
 class Left(BaseFunction):
     """ Take the leftmost characters of a string (string, count)
@@ -211,6 +261,8 @@ class Left(BaseFunction):
     
     """
 
+    __slots__ = ()
+
     def __init__(self, text, length):
         BaseFunction.__init__(self, text, length)
 
@@ -222,6 +274,8 @@ class Right(BaseFunction):
     
     """
 
+    __slots__ = ()
+
     def __init__(self, text, length):
         BaseFunction.__init__(self, text, length)
 
@@ -233,6 +287,8 @@ class Substring(BaseFunction):
     
     """
 
+    __slots__ = ()
+
     def __init__(self, text, position, length=None):
         if length is None:
             BaseFunction.__init__(self, text, position)
@@ -247,6 +303,8 @@ class Contains(BaseFunction):
     
     """
 
+    __slots__ = ()
+
     def __init__(self, text, substring):
         BaseFunction.__init__(self, text, substring)
 
@@ -258,6 +316,8 @@ class Like(BaseFunction):
     
     """
 
+    __slots__ = ()
+
     def __init__(self, text, pattern):
         BaseFunction.__init__(self, text, pattern)
 
@@ -269,6 +329,8 @@ class NotLike(BaseFunction):
     
     """
 
+    __slots__ = ()
+
     def __init__(self, text, pattern):
         BaseFunction.__init__(self, text, pattern)
 
@@ -280,6 +342,8 @@ class Match(BaseFunction):
     
     """
 
+    __slots__ = ()
+
     def __init__(self, text, pattern):
         BaseFunction.__init__(self, text, pattern)
 
@@ -291,6 +355,8 @@ class NotMatch(BaseFunction):
     
     """
 
+    __slots__ = ()
+
     def __init__(self, text, pattern):
         BaseFunction.__init__(self, text, pattern)
 
@@ -308,6 +374,8 @@ class FullTextSearch(BaseFunction):
     
     """
 
+    __slots__ = ()
+
     def __init__(self, column, pattern):
         BaseFunction.__init__(self, column, pattern)
 
@@ -318,6 +386,8 @@ class Coalesce(BaseFunction):
     """ Results in the first not-NULL expression or NULL if all are NULL
     """
 
+    __slots__ = ()
+
 # TODO: If-Else, Case-Else
 
 ### GIS functions
@@ -1,41 +1,47 @@
 """ Index definitions
 """
 
-from dblayer import util
+from dblayer import util, constants
 
 
 class BaseIndex:
     """ Base class for database indexes models
     """
 
-    # Serial number to record the order of column definitions
-    __definition_serial__ = 0
+    __slots__ = (
+        # Serial number to record the order of index definitions
+        '__definition_serial__',
 
-    # Reference to the table class containing this column
-    # NOTE: Set by __new__ of the table definition class
-    table_class = None
+        # Reference to the table class containing this index
+        # NOTE: Set by Table.initialize, called by Table.__init_subclass__
+        'table_class',
 
-    # Reference to the table instance containing this column or None for model columns
-    # NOTE: Filled in by Table.__init__ as part of cloning the columns from the class to the instance
-    table = None
+        # Reference to the table instance containing this index or None for model indexes
+        # NOTE: Filled in by Table.__init__ as part of cloning the indexes from the class to the instance
+        'table',
 
-    # Name of the constraint
-    # NOTE: Set by __new__ in the table definition class
-    name = ''
+        # Name of the index
+        # NOTE: Set by Table.initialize, called by Table.__init_subclass__
+        'name',
 
-    # List of the member columns
-    columns = ()
+        # List of the member columns
+        'columns',
 
-    # Indicates that this model object is added implicitly by some other model object
-    implicit = False
+        # Indicates that this model object is added implicitly by some other model object
+        'implicit')
 
-    @staticmethod
-    def sort_key(obj):
-        return obj.__definition_serial__
+    # Short module name and class name used as the prefix of repr
+    # NOTE: Set by __init_subclass__ for each subclass
+    _repr_name = 'index.BaseIndex'
+
+    def __init_subclass__(cls, **kwargs):
+        super().__init_subclass__(**kwargs)
+        cls._repr_name = '%s.%s' % (cls.__module__.rsplit('.', 1)[-1], cls.__name__)
 
     def __init__(self, *columns):
-        assert self.__class__ is not BaseIndex, (
-            'Only subclasses of BaseIndex can be instantiated!')
+        if constants.DEBUG:
+            assert self.__class__ is not BaseIndex, (
+                'Only subclasses of BaseIndex can be instantiated!')
 
         # Record the definition order
         self.__definition_serial__ = util.get_next_definition_serial()
@@ -44,6 +50,11 @@ class BaseIndex:
         assert columns, 'This index must be applied to at least one column!'
         self.columns = columns
 
+        self.table_class = None
+        self.table = None
+        self.name = ''
+        self.implicit = False
+
     def __str__(self):
         return '<%s Index: %s.%s on %s>' % (
             self.__class__.__name__,
@@ -52,9 +63,8 @@ class BaseIndex:
             ', '.join(column.name for column in self.columns))
 
     def __repr__(self):
-        return '%s.%s(%s)' % (
-            self.__class__.__module__.rsplit('.', 1)[-1],
-            self.__class__.__name__,
+        return '%s(%s)' % (
+            self._repr_name,
             ', '.join(column.name for column in self.columns))
 
     def clone(self, table):
@@ -63,24 +73,29 @@ class BaseIndex:
         NOTE: It is called by Table.__init__ to bound the columns to the table instance.
         
         """
-        clone = self.__class__(None)
-        clone.__dict__.update(self.__dict__)
+        clone = object.__new__(self.__class__)
+        for name in BaseIndex.__slots__:
+            setattr(clone, name, getattr(self, name))
         clone.columns = [getattr(table, column.name) for column in self.columns]
         clone.table = table
         return clone
 
     def get_implicit_definition_list_for_table_class(self, table_class):
-        """ Returns list of (name, definition) tuples for the implicit definitions
+        """ Returns a sequence of (name, definition) tuples for the implicit definitions
         required on the table model class level
         
+        It is an empty tuple if no implicit definitions are required.
+        
         """
-        return []
+        return ()
 
 
 class Index(BaseIndex):
     """ Regular B-Tree based index
     """
 
+    __slots__ = ()
+
 
 class FullTextSearchIndex(BaseIndex):
     """ Full text search index
@@ -88,3 +103,5 @@ class FullTextSearchIndex(BaseIndex):
     This kind of index is automatically applied to a SearchDocument columns.
     
     """
+
+    __slots__ = ()
@@ -1,35 +1,61 @@
 """ Procedure definitions
 """
 
-from dblayer import util
+from dblayer import util, constants
 
 
 class BaseProcedure:
     """ Base class for stored procedures
     """
 
-    # Serial number to record the order of procedure definitions
-    __definition_serial__ = 0
+    __slots__ = (
+        # Serial number to record the order of procedure definitions
+        '__definition_serial__',
 
-    # Reference to the database class containing this procedure
-    # NOTE: Set by __new__ of the database definition class
-    database_class = None
+        # Reference to the database class containing this procedure
+        # NOTE: Set by Database.initialize on the first instantiation of the database model
+        'database_class',
 
-    # Name of the procedure
-    # NOTE: Set by __new__ of the database definition class
-    name = ''
+        # Reference to the database instance containing this procedure or None for model procedures
+        # NOTE: Set by clone
+        'database',
 
-    @staticmethod
-    def sort_key(obj):
-        return obj.__definition_serial__
+        # Name of the procedure
+        # NOTE: Set by Database.initialize on the first instantiation of the database model
+        'name',
+
+        # Language the body of the procedure is written in
+        'language',
+
+        # List of arguments
+        'argument_list',
+
+        # Result type
+        'result',
+
+        # Source code of the procedure
+        'body')
+
+    # Short module name and class name used as the prefix of repr
+    # NOTE: Set by __init_subclass__ for each subclass
+    _repr_name = 'procedure.BaseProcedure'
+
+    def __init_subclass__(cls, **kwargs):
+        super().__init_subclass__(**kwargs)
+        cls._repr_name = '%s.%s' % (cls.__module__.rsplit('.', 1)[-1], cls.__name__)
 
     def __init__(self, language, argument_list, result, body):
-        assert self.__class__ is not BaseProcedure, (
-            'Only subclasses of BaseProcedure can be instantiated!')
+        if constants.DEBUG:
+            assert self.__class__ is not BaseProcedure, (
+                'Only subclasses of BaseProcedure can be instantiated!')
 
         # Record the definition order
         self.__definition_serial__ = util.get_next_definition_serial()
 
+        self.database_class = None
+        self.database = None
+        self.name = ''
+
         self.language = language
         self.argument_list = argument_list
         self.result = result
@@ -43,9 +69,8 @@ class BaseProcedure:
             self.result)
 
     def __repr__(self):
-        return '%s.%s(%r, %r, %r, %r)' % (
-            self.__class__.__module__.rsplit('.', 1)[-1],
-            self.__class__.__name__,
+        return '%s(%r, %r, %r, %r)' % (
+            self._repr_name,
             self.language,
             self.argument_list,
             self.result,
@@ -57,8 +82,9 @@ class BaseProcedure:
         NOTE: It is called by Database.__init__ to bound the procedures to the database instance.
         
         """
-        clone = self.__class__(None)
-        clone.__dict__.update(self.__dict__)
+        clone = object.__new__(self.__class__)
+        for name in BaseProcedure.__slots__:
+            setattr(clone, name, getattr(self, name))
         clone.database = database
         return clone
 
@@ -66,3 +92,5 @@ class BaseProcedure:
 class Procedure(BaseProcedure):
     """ Stored procedure
     """
+
+    __slots__ = ()
@@ -1,12 +1,38 @@
 """ Base class for query definitions
 """
 
-from dblayer import constants
+from dblayer import util, constants
 
 from dblayer.model import table, column, index
 
 
-class Query(table.Table):
+def get_query_definition_list_name(value_type, cache={}):
+    """ Returns the name of the query class attribute collecting the source tables,
+    results or conditions of the given type, None for any other type
+    
+    Query results are columns as well, so the classification of table
+    definitions in table.get_definition_list_name does not apply here.
+    
+    """
+    try:
+        return cache[value_type]
+    except KeyError:
+        pass
+
+    if issubclass(value_type, table.Table):
+        list_name = '_table_map'
+    elif issubclass(value_type, Result):
+        list_name = '_column_list'
+    elif issubclass(value_type, Condition):
+        list_name = '_condition_list'
+    else:
+        list_name = None
+
+    cache[value_type] = list_name
+    return list_name
+
+
+class Query(table.Table, abstract=True):
     """ Query
     """
     # Queries need not be created and cannot be written
@@ -14,11 +40,11 @@ class Query(table.Table):
     _writable = False
 
     # Mapping of alias names to the source Table instances
-    # NOTE: Filled in by the __new__ class method
+    # NOTE: Filled in by the initialize class method
     _table_map = None
 
     # Conditions
-    # NOTE: Filled in by the __new__ class method
+    # NOTE: Filled in by the initialize class method
     _condition_list = ()
 
     # Group by expressions (override in your subclass)
@@ -27,21 +53,17 @@ class Query(table.Table):
     # Ordering expressions (override in your subclass)
     _order_by = ()
 
-    def __new__(cls):
-        # Initialize the class only once
-        if not cls._initialized:
-            cls.initialize()
+    # Source code formatted by pretty_format_class, cached per query class
+    _pretty_formatted_source = None
 
-        return super(Query, cls).__new__(cls)
+    # Table list built by get_table_list, cached per query class
+    _table_list_cache = None
 
     @classmethod
     def initialize(cls):
 
-        # Mark the class as initialized
-        # NOTE: It prevent Table's initialization from being executed, it is intentional
-        cls._initialized = True
-
         # Collect objects from the class definition
+        # NOTE: It replaces Table's initialization, it is intentional
         cls._collect_result_condition_list()
 
     @classmethod
@@ -51,26 +73,39 @@ class Query(table.Table):
         cls._table_map = {}
         cls._column_list = []
         cls._condition_list = []
-        for name in dir(cls):
-            value = getattr(cls, name)
 
-            if isinstance(value, table.Table):
+        # Append methods of the definition lists by list name
+        append_definition_map = {
+            '_column_list': cls._column_list.append,
+            '_condition_list': cls._condition_list.append,
+        }
+
+        for name, value in util.get_class_attribute_items(cls):
+
+            # Model definitions never have private names
+            if name.startswith('_'):
+                continue
+
+            list_name = get_query_definition_list_name(type(value))
+            if list_name is None:
+                continue
+
+            if list_name == '_table_map':
                 value._name = name
                 cls._table_map[name] = value
+                continue
 
-            elif isinstance(value, Result):
-                value.table_class = cls
-                value.name = name
-                cls._column_list.append(value)
-
-            elif isinstance(value, Condition):
-                value.table_class = cls
-                value.name = name
-                cls._condition_list.append(value)
+            value.table_class = cls
+            value.name = name
+            append_definition_map[list_name](value)
 
         # Sort them by definition order
-        cls._column_list.sort(key=column.BaseColumn.sort_key)
-        cls._condition_list.sort(key=Condition.sort_key)
+        cls._column_list.sort(key=util.definition_order_key)
+        cls._condition_list.sort(key=util.definition_order_key)
+
+        # Keep the table aliases in name order, like dir() listed them before,
+        # since the FROM clause and pretty_format_class depend on this order
+        cls._table_map = dict(sorted(cls._table_map.items()))
 
     def __repr__(self):
         return '<Query: %s>' % self._name
@@ -87,70 +122,89 @@ class Query(table.Table):
         
         Unaliased tables are not used here.
         
+        The list is built only once for each query class, do not modify it.
+        
         """
-        table_map = self._table_map.copy()
+        # The table list depends only on the query class
+        table_list = self.__class__.__dict__.get('_table_list_cache')
+        if table_list is not None:
+            return table_list
+
+        # Local bindings for the constants used in the loops below
+        LEFT_JOIN = constants.LEFT_JOIN
+        INNER_JOIN = constants.INNER_JOIN
+        DEBUG = constants.DEBUG
+
+        # Group the tables by their referer table in the JOIN chain,
+        # the tables starting a new cross join group have no referer
+        referred_table_list_map = {}
+        for alias_name, table in self._table_map.items():
+            foreign_key = table._referer
+            if foreign_key is None:
+                referer_table = join_type = None
+            else:
+                referer_table = foreign_key.table
+                join_type = LEFT_JOIN if foreign_key.null else INNER_JOIN
+            referred_table_list_map.setdefault(referer_table, []).append(
+                (alias_name, table, foreign_key, join_type))
 
-        def iterate_joined_tables(referer, visited):
+        table_list = []
+        append_item = table_list.append
+
+        def append_joined_tables(referer):
             """ Appends tables referenced from the given table to the table list
             """
-            # Iterate on all the tables remained in the table map
-            for alias_name, table in table_map.items():
-
-                # Determine the referer table for this table in the JOIN chain
-                foreign_key = table._referer
-                referer_table = foreign_key.table if foreign_key else None
-
-                # Is the referer the table we're looking for?
-                if referer_table is referer and alias_name not in visited:
-
-                    # Consider each table only once
-                    visited.add(alias_name)
-
-                    # Construct table list item
-                    if referer is None:
-                        item = (
-                            # Database table name, not the alias in this query
-                            table._table_name,
-                            # Alias name in this query for this table
-                            alias_name)
-                    else:
-                        join_type = constants.LEFT_JOIN if foreign_key.null else constants.INNER_JOIN
-                        item = (
-                            # Database table name, not the alias in this query
-                            table._table_name,
-                            # Alias name in this query for this table
-                            alias_name,
-                            # Type of this joine, like INNER JOIN or LEFT JOIN
-                            join_type,
-                            # Name of the primary key column in the joined table
-                            table._primary_key.name,
-                            # Alias name of the referer (already joined) table
-                            referer_table._name,
-                            # Name of the referer foreign key column in the referer (already joined) table
-                            foreign_key.name)
-
-                    if constants.DEBUG:
-                        assert not sum(1 for x in item if not x), 'Empty name(s) in join definition item: %r' % (item,)
-
-                    # Yield table list item
-                    yield item
-
-                    # Find all the referer tables below this point in the tree
-                    for item in iterate_joined_tables(table, visited):
-                        yield item
-
-        visited = set()
-        table_list = list(iterate_joined_tables(None, visited))
-        assert len(visited) == len(table_map)
-
+            # Consider each table only once
+            for alias_name, table, foreign_key, join_type in referred_table_list_map.pop(referer, ()):
+
+                # Construct table list item
+                if referer is None:
+                    item = (
+                        # Database table name, not the alias in this query
+                        table._table_name,
+                        # Alias name in this query for this table
+                        alias_name)
+                else:
+                    item = (
+                        # Database table name, not the alias in this query
+                        table._table_name,
+                        # Alias name in this query for this table
+                        alias_name,
+                        # Type of this joine, like INNER JOIN or LEFT JOIN
+                        join_type,
+                        # Name of the primary key column in the joined table
+                        table._primary_key.name,
+                        # Alias name of the referer (already joined) table
+                        referer._name,
+                        # Name of the referer foreign key column in the referer (already joined) table
+                        foreign_key.name)
+
+                if DEBUG:
+                    assert not sum(1 for x in item if not x), 'Empty name(s) in join definition item: %r' % (item,)
+
+                append_item(item)
+
+                # Find all the referer tables below this point in the tree
+                append_joined_tables(table)
+
+        append_joined_tables(None)
+
+        if DEBUG:
+            assert len(table_list) == len(self._table_map), (
+                'Some of the tables could not be reached in the JOIN chain of query: %s' %
+                self.__class__.__name__)
+
+        self.__class__._table_list_cache = table_list
         return table_list
 
     @classmethod
     def pretty_format_class(cls):
         """ Formats source code defining the query
         """
-        if not cls._initialized:
-            cls.initialize()
+        # The source is formatted only once for each model class
+        source = cls.__dict__.get('_pretty_formatted_source')
+        if source is not None:
+            return source
 
         line_list = ['class %s(query.Query):' % cls.__name__]
         append_line = line_list.append
@@ -163,18 +217,27 @@ class Query(table.Table):
         else:
             append_line('')
 
-        for alias, table in sorted(cls._table_map.items()):
-            append_line('    %s = %s()' % (alias, table.__class__.__name__))
-        append_line('')
+        extend_lines = line_list.extend
 
-        for obj in cls._column_list:
-            append_line('    %s = %s' % (obj.name, obj.full_repr()))
+        extend_lines(
+            '    %s = %s()' % (alias, table.__class__.__name__)
+            for alias, table in sorted(cls._table_map.items()))
+        append_line('')
 
+        extend_lines(
+            '    %s.join(%r)' % (alias, table._referer)
+            for alias, table in sorted(cls._table_map.items())
+            if table._referer is not None)
         append_line('')
 
-        for obj in cls._condition_list:
-            append_line('    %s = %s' % (obj.name, obj.full_repr()))
+        extend_lines(
+            '    %s = %s' % (obj.name, obj.full_repr())
+            for obj in cls._column_list)
+        append_line('')
 
+        extend_lines(
+            '    %s = %s' % (obj.name, obj.full_repr())
+            for obj in cls._condition_list)
         append_line('')
 
         if cls._group_by:
@@ -183,11 +246,16 @@ class Query(table.Table):
         if cls._order_by:
             append_line('    _order_by = %r' % (cls._order_by,))
 
-        for i in range(len(line_list) - 1, 1, -1):
-            if not line_list[i] and not line_list[i - 1]:
-                del line_list[i]
+        # Collapse consecutive empty lines
+        compact_line_list = []
+        previous_line_empty = False
+        for line in line_list:
+            if line or not previous_line_empty:
+                compact_line_list.append(line)
+            previous_line_empty = not line
 
-        return '\n'.join(line_list)
+        cls._pretty_formatted_source = source = '\n'.join(compact_line_list)
+        return source
 
 
 class BaseQueryResult(column.BaseColumn):
@@ -211,8 +279,9 @@ class BaseQueryResult(column.BaseColumn):
     def __init__(self, expression, column_type=None, doc=None):
         column.BaseColumn.__init__(self, doc=doc)
 
-        assert self.__class__ is not BaseQueryResult, (
-            'Only subclasses of BaseQueryResult can be instantiated!')
+        if constants.DEBUG:
+            assert self.__class__ is not BaseQueryResult, (
+                'Only subclasses of BaseQueryResult can be instantiated!')
 
         # Cloning the column?
         if expression is None:
@@ -238,7 +307,7 @@ class BaseQueryResult(column.BaseColumn):
         NOTE: It is called by Table.__init__ to bound the columns to the table instance.
         
         """
-        clone = self.__class__(None)
+        clone = object.__new__(self.__class__)
         clone.__dict__.update(self.__dict__)
         clone.table = table
         return clone
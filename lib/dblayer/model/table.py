@@ -1,11 +1,40 @@
 """ Base class for database table definitions
 """
 
+import io
+
 from dblayer import util, constants
 
 from dblayer.model import column, constraint, index, trigger
 
 
+def get_definition_list_name(value_type, cache={}):
+    """ Returns the name of the table class attribute collecting the definitions
+    of the given type or None if the type is not a table definition
+    
+    The type checks are done only once for each type.
+    
+    """
+    try:
+        return cache[value_type]
+    except KeyError:
+        pass
+
+    if issubclass(value_type, column.BaseColumn):
+        list_name = '_column_list'
+    elif issubclass(value_type, constraint.BaseConstraint):
+        list_name = '_constraint_list'
+    elif issubclass(value_type, index.BaseIndex):
+        list_name = '_index_list'
+    elif issubclass(value_type, trigger.BaseTrigger):
+        list_name = '_trigger_list'
+    else:
+        list_name = None
+
+    cache[value_type] = list_name
+    return list_name
+
+
 class Table:
     """ Base class for database table models
     
@@ -25,20 +54,17 @@ class Table:
     # True value indicates that this object is writable in the database
     _writable = True
 
-    # Flag indicating that the model has been initialized
-    _initialized = False
-
     # Reference to the database class containing this table
-    # NOTE: Set by __new__ of the database definition class
+    # NOTE: Set by Database.initialize on the first instantiation of the database model
     _database_class = None
 
     # Name of the database table (never the alias name)
-    # NOTE: Set by __new__ of the database definition class
+    # NOTE: Set by Database.initialize on the first instantiation of the database model
     _table_name = ''
 
     # Name of the table, it can be either a database table name in the case
     # of a physical table or an alias name while referencing from a view
-    # NOTE: Set by __new__ of the database and query definition classes
+    # NOTE: Set by Database.initialize and by Query.initialize for the table aliases
     _name = ''
 
     # List of column definitions in definition order
@@ -61,75 +87,72 @@ class Table:
     # Foreign key column referencing this table instance inside a query if any
     _referer = None
 
-    # Serial number to record the order of column definitions
-    __definition_serial__ = 0
-
     def __repr__(self):
         return '<Table: %s>' % self._name
 
     __str__ = __repr__
 
-    @staticmethod
-    def _sort_key(obj):
-        """ Sort key to preserve the lexical definition order
-        """
-        return obj.__definition_serial__
+    def __init_subclass__(cls, abstract=False, **kwargs):
+        super().__init_subclass__(**kwargs)
 
-    def __new__(cls):
-        # Initialize the class only once
-        if not cls._initialized:
+        # Initialize each model class once, right after its definition.
+        # Abstract base classes like Query pass abstract=True to skip it.
+        if not abstract:
             cls.initialize()
 
-        return super(Table, cls).__new__(cls)
-
     @classmethod
     def initialize(cls):
 
-        # Mark the class as initialized
-        cls._initialized = True
-
         # Assign name to constraints and indexes and collect them
         cls._prepare_table_definition()
 
     @classmethod
     def _prepare_table_definition(cls):
-        """ Prepares the table definition before the first instantiation
+        """ Prepares the table definition right after the class definition
         """
         cls._column_list = []
         cls._constraint_list = []
         cls._index_list = []
         cls._trigger_list = []
-        for name in dir(cls):
-            value = getattr(cls, name)
-
-            if isinstance(value, column.BaseColumn):
-                value.name = name
-                value.table_class = cls
-                cls._column_list.append(value)
-                if value.primary_key:
-                    assert cls._primary_key is None, 'More than one primary key columns are defined for table: %s' % cls.__name__
-                    cls._primary_key = value
-
-            elif isinstance(value, constraint.BaseConstraint):
-                value.name = name
-                value.table_class = cls
-                cls._constraint_list.append(value)
-
-            elif isinstance(value, index.BaseIndex):
-                value.name = name
-                value.table_class = cls
-                cls._index_list.append(value)
-
-            elif isinstance(value, trigger.BaseTrigger):
-                value.name = name
-                value.table_class = cls
-                cls._trigger_list.append(value)
+        cls._primary_key = None
+
+        # Append methods of the definition lists by list name
+        append_definition_map = {
+            '_column_list': cls._column_list.append,
+            '_constraint_list': cls._constraint_list.append,
+            '_index_list': cls._index_list.append,
+            '_trigger_list': cls._trigger_list.append,
+        }
+
+        attribute_name_set = set()
+        for name, value in util.get_class_attribute_items(cls):
+
+            list_name = get_definition_list_name(type(value))
+            if list_name is None:
+                attribute_name_set.add(name)
+                continue
+
+            # Implicit definitions inherited from an initialized base table model
+            # are not collected, they are added again for this class below
+            # NOTE: The implicit flag of columns has a different meaning
+            if list_name != '_column_list' and value.implicit:
+                continue
+
+            attribute_name_set.add(name)
+
+            value.name = name
+            value.table_class = cls
+            append_definition_map[list_name](value)
+
+            if list_name == '_column_list' and value.primary_key:
+                assert cls._primary_key is None, 'More than one primary key columns are defined for table: %s' % cls.__name__
+                cls._primary_key = value
 
         # Sort the definition objects to keep their source code order
-        cls._column_list.sort(key=column.BaseColumn.sort_key)
-        cls._constraint_list.sort(key=constraint.BaseConstraint.sort_key)
-        cls._index_list.sort(key=index.BaseIndex.sort_key)
-        cls._trigger_list.sort(key=trigger.BaseTrigger.sort_key)
+        cls._column_list.sort(key=util.definition_order_key)
+        cls._constraint_list.sort(key=util.definition_order_key)
+        cls._index_list.sort(key=util.definition_order_key)
+        cls._trigger_list.sort(key=util.definition_order_key)
 
         # If we have a primary key column, then it must be the first one
         if cls._primary_key:
@@ -139,19 +162,15 @@ class Table:
         # Add implicit definitions required by some of the existing definitions
         for member in cls._column_list + cls._index_list:
             for name, definition in member.get_implicit_definition_list_for_table_class(cls):
-                assert not hasattr(cls, name), (
+                assert name not in attribute_name_set, (
                         'Attribute name %s.%s collides with implicit %s definition required by %s.%s!' %
                         (cls.__name__, name, definition.__class__.__name__, cls.__name__, member.name))
-                if isinstance(definition, constraint.BaseConstraint):
-                    cls._constraint_list.append(definition)
-                elif isinstance(definition, index.BaseIndex):
-                    cls._index_list.append(definition)
-                elif isinstance(definition, trigger.BaseTrigger):
-                    cls._trigger_list.append(definition)
-                else:
+                list_name = get_definition_list_name(type(definition))
+                if list_name is None or list_name == '_column_list':
                     raise TypeError(
                         'Unsupported implicit definition required by %s.%s: %r' %
                         (cls.__name__, member.name, definition))
+                append_definition_map[list_name](definition)
                 definition.table_class = cls
                 definition.name = name
                 definition.implicit = True
@@ -162,24 +181,24 @@ class Table:
         assert self.__class__ is not Table, (
             'Only subclasses of Table can be instantiated!')
 
-        # Record the definition order
-        self.__definition_serial__ = util.get_next_definition_serial()
-
-        # Clone columns, constraints and indexes
-        self._column_list = [column.clone(self) for column in self._column_list]
-        self._constraint_list = [constraint.clone(self) for constraint in self._constraint_list]
-        self._index_list = [index.clone(self) for index in self._index_list]
-        self._trigger_list = [trigger.clone(self) for trigger in self._trigger_list]
-
-        # Override the model definitions with the bound instances
-        for column in self._column_list:
-            setattr(self, column.name, column)
-        for constraint in self._constraint_list:
-            setattr(self, constraint.name, constraint)
-        for index in self._index_list:
-            setattr(self, index.name, index)
-        for trigger in self._trigger_list:
-            setattr(self, trigger.name, trigger)
+        # Clone the columns, constraints, indexes and triggers and override the
+        # model definitions with the bound instances in a single pass per kind
+        # NOTE: None of the definitions are descriptors, so they can be stored directly
+        # NOTE: Definitions inherited from mixins are shared by multiple table classes,
+        # so the table class of the bound instances is always set explicitly here
+        # NOTE: The columns are bound first, so the constraints and indexes
+        # cloned later resolve their columns to the bound column instances
+        instance_dict = self.__dict__
+        table_class = self.__class__
+        for list_name in ('_column_list', '_constraint_list', '_index_list', '_trigger_list'):
+            bound_list = []
+            append_bound = bound_list.append
+            for definition in getattr(table_class, list_name):
+                bound = definition.clone(self)
+                bound.table_class = table_class
+                instance_dict[bound.name] = bound
+                append_bound(bound)
+            instance_dict[list_name] = bound_list
 
         # Reassign the primary key
         if self._primary_key:
@@ -210,43 +229,36 @@ class Table:
     def pretty_format_class(cls):
         """ Formats source code defining the table
         """
-        line_list = ['class %s(table.Table):' % cls.__name__]
-        append_line = line_list.append
+        buffer = io.StringIO()
+        write = buffer.write
+        write('class %s(table.Table):\n' % cls.__name__)
 
         if cls.__doc__:
             if '\n' in cls.__doc__:
-                append_line('    """%s"""' % cls.__doc__)
+                write('    """%s"""\n' % cls.__doc__)
             else:
-                append_line('    """ %s """' % cls.__doc__.strip())
+                write('    """ %s """\n' % cls.__doc__.strip())
         else:
-            append_line('')
+            write('\n')
 
         extra_line_list = []
 
         for obj in cls._column_list:
+            # NOTE: References to this class are formatted as None by full_repr,
+            # since the class is not defined yet while its body is executed
+            write('    %s = %s\n' % (obj.name, obj.full_repr()))
             if isinstance(obj, column.ForeignKey) and obj.referenced_table_class is cls:
-                obj.referenced_table_class = None
-                append_line('    %s = %s' % (obj.name, obj.full_repr()))
-                obj.referenced_table_class = cls
-                extra_line_list.append('%s.%s.referenced_table_class = %s' % (
+                extra_line_list.append('%s.%s.referenced_table_class = %s\n' % (
                     cls.__name__, obj.name, cls.__name__))
-            else:
-                append_line('    %s = %s' % (obj.name, obj.full_repr()))
-
-        for obj in cls._constraint_list:
-            if not obj.implicit:
-                append_line('    %s = %r' % (obj.name, obj))
-
-        for obj in cls._index_list:
-            if not obj.implicit:
-                append_line('    %s = %r' % (obj.name, obj))
 
-        for obj in cls._trigger_list:
-            if not obj.implicit:
-                append_line('    %s = %r' % (obj.name, obj))
+        for definition_list in (cls._constraint_list, cls._index_list, cls._trigger_list):
+            for obj in definition_list:
+                if not obj.implicit:
+                    write('    %s = %r\n' % (obj.name, obj))
 
         if extra_line_list:
-            append_line('')
-            line_list.extend(extra_line_list)
+            write('\n')
+            buffer.writelines(extra_line_list)
 
-        return '\n'.join(line_list)
+        # Strip the newline after the last line
+        return buffer.getvalue()[:-1]
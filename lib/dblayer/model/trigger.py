@@ -4,27 +4,46 @@
 from dblayer import util
 
 
+def intern_procedure_parameters(procedure_parameters, cache={}):
+    """ Returns the first seen procedure parameter tuple equal to the one given
+    
+    Tuples containing unhashable parameters are returned as is.
+    
+    """
+    try:
+        return cache.setdefault(procedure_parameters, procedure_parameters)
+    except TypeError:
+        return procedure_parameters
+
+
 class BaseTrigger:
     """ Base class for database triggers
     """
 
-    # Serial number to record the order of trigger definitions
-    __definition_serial__ = 0
+    __slots__ = (
+        # Serial number to record the order of trigger definitions
+        '__definition_serial__',
 
-    # Reference to the table class containing this trigger
-    # NOTE: Set by __new__ of the table definition class
-    table_class = None
+        # Reference to the table class containing this trigger
+        # NOTE: Set by Table.initialize, called by Table.__init_subclass__
+        'table_class',
 
-    # Reference to the table instance containing this trigger or None for model triggers
-    # NOTE: Filled in by Table.__init__ as part of cloning the triggers from the class to the instance
-    table = None
+        # Reference to the table instance containing this trigger or None for model triggers
+        # NOTE: Filled in by Table.__init__ as part of cloning the triggers from the class to the instance
+        'table',
 
-    # Name of the trigger
-    # NOTE: Set by __new__ of the table definition class
-    name = ''
+        # Name of the trigger
+        # NOTE: Set by Table.initialize, called by Table.__init_subclass__
+        'name',
 
-    # Indicates that this model object is added implicitly by some other model object
-    implicit = False
+        # Indicates that this model object is added implicitly by some other model object
+        'implicit',
+
+        # Name of the stored procedure executed by the trigger
+        'procedure_name',
+
+        # Tuple of the parameters passed to the stored procedure
+        'procedure_parameters')
 
     def __str__(self):
         return '<%s Trigger: %s.%s>' % (
@@ -39,10 +58,6 @@ class BaseTrigger:
             self.procedure_name,
             ''.join(', %r' % parameter for parameter in self.procedure_parameters))
 
-    @staticmethod
-    def sort_key(obj):
-        return obj.__definition_serial__
-
     def __init__(self, procedure_name, *procedure_parameters):
         assert self.__class__ is not BaseTrigger, (
             'Only subclasses of BaseTrigger can be instantiated!')
@@ -50,8 +65,13 @@ class BaseTrigger:
         # Record the definition order
         self.__definition_serial__ = util.get_next_definition_serial()
 
+        self.table_class = None
+        self.table = None
+        self.name = ''
+        self.implicit = False
+
         self.procedure_name = procedure_name
-        self.procedure_parameters = procedure_parameters
+        self.procedure_parameters = intern_procedure_parameters(procedure_parameters)
 
     def clone(self, table):
         """ Clone this trigger for a table instance
@@ -59,8 +79,9 @@ class BaseTrigger:
         NOTE: It is called by Table.__init__ to bound the triggers to the table instance.
         
         """
-        clone = self.__class__(None)
-        clone.__dict__.update(self.__dict__)
+        clone = object.__new__(self.__class__)
+        for name in BaseTrigger.__slots__:
+            setattr(clone, name, getattr(self, name))
         clone.table = table
         return clone
 
@@ -69,77 +90,109 @@ class BeforeInsertRow(BaseTrigger):
     """ Trigger executed before inserting a database row
     """
 
+    __slots__ = ()
+
 
 class BeforeUpdateRow(BaseTrigger):
     """ Trigger executed before updating a database row
     """
 
+    __slots__ = ()
+
 
 class BeforeInsertOrUpdateRow(BaseTrigger):
     """ Trigger executed before inserting or updating a database row
     """
 
+    __slots__ = ()
+
 
 class BeforeDeleteRow(BaseTrigger):
     """ Trigger executed before deleting a database row
     """
 
+    __slots__ = ()
+
 
 class BeforeInsertStatement(BaseTrigger):
     """ Trigger executed before executing an insert statement
     """
 
+    __slots__ = ()
+
 
 class BeforeUpdateStatement(BaseTrigger):
     """ Trigger executed before executing an update statement
     """
 
+    __slots__ = ()
+
 
 class BeforeInsertOrUpdateStatement(BaseTrigger):
     """ Trigger executed before executing an insert or update statement
     """
 
+    __slots__ = ()
+
 
 class BeforeDeleteStatement(BaseTrigger):
     """ Trigger executed before executing a delete statement
     """
 
+    __slots__ = ()
+
 
 class AfterInsertRow(BaseTrigger):
     """ Trigger executed before inserting a database row
     """
 
+    __slots__ = ()
+
 
 class AfterUpdateRow(BaseTrigger):
     """ Trigger executed before updating a database row
     """
 
+    __slots__ = ()
+
 
 class AfterInsertOrUpdateRow(BaseTrigger):
     """ Trigger executed before inserting or updating a database row
     """
 
+    __slots__ = ()
+
 
 class AfterDeleteRow(BaseTrigger):
     """ Trigger executed before deleting a database row
     """
 
+    __slots__ = ()
+
 
 class AfterInsertStatement(BaseTrigger):
     """ Trigger executed before executing an insert statement
     """
 
+    __slots__ = ()
+
 
 class AfterUpdateStatement(BaseTrigger):
     """ Trigger executed before executing an update statement
     """
 
+    __slots__ = ()
+
 
 class AfterInsertOrUpdateStatement(BaseTrigger):
     """ Trigger executed before executing an insert or update statement
     """
 
+    __slots__ = ()
+
 
 class AfterDeleteStatement(BaseTrigger):
     """ Trigger executed before executing a delete statement
     """
+
+    __slots__ = ()
@@ -1,17 +1,33 @@
 """ Test constants
 """
 
+import os
+
 # Enable this to debug rolling back to savepoints on conflicting primary keys
 ##if constants.DEBUG:
 ##    constants.DATABASE_ID_RANGE = (1, 10)
 ##    constants.MAX_INSERT_RETRY_COUNT = 3
 
 # Database to use for testing
-TEST_DSN = "dbname='dblayer' user='dblayer' host='localhost' password='dblayer'"
+# NOTE: It can be overridden by the DBLAYER_TEST_DSN environment variable,
+# so parallel test runs can use a separate database for each worker process
+TEST_DSN = os.environ.get(
+    'DBLAYER_TEST_DSN',
+    "dbname='dblayer' user='dblayer' host='localhost' password='dblayer'")
+
+# Enables creating the table, query and database models twice while
+# building the test model to verify that they are initialized only once
+# NOTE: The dedicated unit test case covers this regardless of this setting
+TEST_DOUBLE_INIT = False
 
 # Enables dropping of the test tables after running the unit test cases
 LEAVE_CLEAN_DATABASE = True
 
+# Disables waiting for the WAL flush on committing the test transactions
+# NOTE: The test data is disposable, so losing the last commits on a database
+# server crash does not matter. It affects only the test database sessions.
+ASYNCHRONOUS_COMMIT = True
+
 # Regular expressions used by the test check constraints
 RXP_IDENTIFIER = r'^[a-zA-Z_][a-zA-Z_0-9]*$'
 RXP_EMAIL = r'^[\w\-\.]+@[\w\-]+(?:\.[\w\-]+)*$'
@@ -1,6 +1,14 @@
 """ Data model used for the unit test cases
 """
 
+import hashlib
+import os
+import re
+import sys
+import types
+
+import bottle
+
 import dblayer
 
 import dblayer.backend.postgresql
@@ -8,6 +16,13 @@ from dblayer.model import database, table, column, index, constraint
 from dblayer.model import query, aggregate, function, trigger, procedure
 from dblayer.test import constants
 
+# Timestamps in the docstrings of the generated modules
+RX_TIMESTAMP = re.compile(r'\d{4}-\d{2}-\d{2} \d{2}:\d{2}:\d{2}')
+
+# First line of the generated modules, holding the hash of the generator inputs
+CACHE_HEADER_FORMAT = '# dblayer-cache: %s\n'
+RX_CACHE_HEADER = re.compile(r'# dblayer-cache: \w+\n')
+
 
 ### Mixins
 
@@ -224,8 +239,9 @@ class TestDatabaseModel(database.Database):
 
     # Tables
     user = User()
-    # NOTE: Create twice to test single initialization in __new__
-    user = User()
+    if constants.TEST_DOUBLE_INIT:
+        # NOTE: Create twice to test single initialization
+        user = User()
     group = Group()
     group_user = GroupUser()
     role = Role()
@@ -238,8 +254,9 @@ class TestDatabaseModel(database.Database):
 
     # Queries
     user_contact = UserContact()
-    # NOTE: Create twice to test single initialization in __new__
-    user_contact = UserContact()
+    if constants.TEST_DOUBLE_INIT:
+        # NOTE: Create twice to test single initialization
+        user_contact = UserContact()
     product_sale = ProductSale()
 
     # Stored procedures
@@ -255,12 +272,100 @@ RETURN new;
 
 ### Generate database abstraction layer
 
+def get_generator_input_hash(database_model_class, abstraction_class_name):
+    """ Returns a hash of everything the generated abstraction module depends on
+    
+    Hashes the source of the module defining the database model and the dblayer
+    modules it imports (like the test constants), the source files and templates
+    of the dblayer package (except the tests), the dblayer constants and the
+    version of the template engine. Returns None if the database model class
+    is not defined in a source file.
+    
+    """
+    model_module = sys.modules.get(database_model_class.__module__)
+    model_module_path = getattr(model_module, '__file__', None)
+    if model_module_path is None:
+        return None
+
+    package_path = os.path.dirname(dblayer.__file__)
+    path_list = [model_module_path]
+    path_list.extend(sorted(
+        value.__file__
+        for value in vars(model_module).values()
+        if isinstance(value, types.ModuleType) and
+        value.__name__.partition('.')[0] == 'dblayer' and
+        getattr(value, '__file__', None)))
+    for directory_path, directory_name_list, file_name_list in os.walk(package_path):
+        directory_name_list[:] = sorted(
+            name for name in directory_name_list
+            if name not in ('test', '__pycache__'))
+        path_list.extend(
+            os.path.join(directory_path, name)
+            for name in sorted(file_name_list)
+            if name.endswith(('.py', '.tpl')))
+
+    input_hash = hashlib.blake2b(digest_size=16)
+    input_hash.update(repr((
+        database_model_class.__qualname__,
+        abstraction_class_name,
+        bottle.__version__,
+        sorted(
+            (name, value)
+            for name, value in vars(dblayer.constants).items()
+            if name.isupper() and isinstance(value, (int, str, tuple))),
+    )).encode('utf-8'))
+    for path in path_list:
+        with open(path, 'rb') as source_file:
+            input_hash.update(source_file.read())
+
+    return input_hash.hexdigest()
+
+
 def generate(module_path='abstraction.py',
              database_model_class=TestDatabaseModel,
              abstraction_class_name='TestDatabase'):
+    """ Generates the abstraction module, returns True if it has been written
+    
+    The generation is skipped entirely if the module has been
+    generated from the very same inputs before.
+    
+    """
+    input_hash = get_generator_input_hash(database_model_class, abstraction_class_name)
+    cache_header = '' if input_hash is None else CACHE_HEADER_FORMAT % input_hash
+
+    if os.path.exists(module_path):
+        with open(module_path, 'rt', encoding='utf-8') as module_file:
+            old_source = module_file.read()
+        if cache_header and old_source.startswith(cache_header):
+            return False
+    else:
+        old_source = None
+
     test_database_model = database_model_class(abstraction_class_name)
-    # NOTE: Create twice to test single initialization in __new__
-    test_database_model = database_model_class(abstraction_class_name)
-    source = test_database_model.generate(dblayer.backend.postgresql)
-    with open(module_path, 'wt') as module_file:
-        module_file.write(source.replace('\r\n', '\n'))
+    if constants.TEST_DOUBLE_INIT:
+        # NOTE: Create twice to test single initialization in Database.__new__
+        test_database_model = database_model_class(abstraction_class_name)
+    source = test_database_model.generate(dblayer.backend.postgresql).replace('\r\n', '\n')
+
+    # Do not rewrite the module if only its generation timestamp would change
+    if old_source is not None:
+        old_header_match = RX_CACHE_HEADER.match(old_source)
+        old_cache_header = old_header_match.group() if old_header_match else ''
+        if (RX_TIMESTAMP.sub('', old_source[len(old_cache_header):]) == RX_TIMESTAMP.sub('', source) and
+                (not cache_header or cache_header == old_cache_header)):
+            return False
+
+    source = cache_header + source
+
+    # Write a temporary file first and replace the module with it in one step,
+    # so a failed or concurrent generation never leaves a truncated module behind
+    temp_module_path = '%s.%d.tmp' % (module_path, os.getpid())
+    try:
+        with open(temp_module_path, 'wt', encoding='utf-8', newline='\n') as module_file:
+            module_file.write(source)
+        os.replace(temp_module_path, module_path)
+    finally:
+        if os.path.exists(temp_module_path):
+            os.remove(temp_module_path)
+
+    return True
@@ -1,29 +1,86 @@
 """ Utility functions
 """
 
-import datetime
 import itertools
-import random
+import logging
+import operator
+import os
+import threading
 
 from dblayer import constants
 
 
-def get_next_definition_serial(iterator=itertools.count()):
-    """ Returns the next serial used to sort model definition instances
+# Returns the next serial used to sort model definition instances
+# NOTE: It is the bound method of the counter, so no Python frame is involved.
+get_next_definition_serial = itertools.count().__next__
+
+
+# Sort key to preserve the lexical definition order of model definition instances
+# NOTE: It is implemented in C, so sorting does not call back into Python code.
+definition_order_key = operator.attrgetter('__definition_serial__')
+
+
+def get_class_attribute_items(cls):
+    """ Returns (name, value) pairs for the attributes of a class
+    
+    Looks up the class dictionaries along the MRO directly, so no descriptors
+    are triggered. Definitions in derived classes override the ones in their
+    base classes. Special (double underscore) names are skipped.
+    
     """
-    return next(iterator)
+    attribute_map = {}
+    for klass in reversed(cls.__mro__):
+        attribute_map.update(klass.__dict__)
+    return [
+        (name, value)
+        for name, value in attribute_map.items()
+        if not name.startswith('__')]
 
 
-def get_random_id(random=random.SystemRandom()):
+def get_random_id(random_id_list=[], random_id_key_list=[None], lock=threading.Lock()):
     """ Returns a new random database ID value
+    
+    The random bytes are read from the operating system in batches of
+    constants.RANDOM_ID_BATCH_SIZE values, not once for each ID. The IDs
+    generated in advance are discarded if DATABASE_ID_RANGE is changed and
+    in forked child processes, so the processes do not share them.
+    
     """
-    return random.randrange(*constants.DATABASE_ID_RANGE)
+    with lock:
+        random_id_key = (os.getpid(), constants.DATABASE_ID_RANGE)
+        if not random_id_list or random_id_key_list[0] != random_id_key:
+            del random_id_list[:]
+            random_id_key_list[0] = random_id_key
+            low, high = constants.DATABASE_ID_RANGE
+            size = high - low
+            bit_count = (size - 1).bit_length()
+            if constants.DEBUG:
+                assert 0 < size and bit_count <= 64, 'Unsupported database ID range: %r' % (constants.DATABASE_ID_RANGE,)
+            mask = (1 << bit_count) - 1
+            while not random_id_list:
+                random_bytes = os.urandom(8 * constants.RANDOM_ID_BATCH_SIZE)
+                # Rejection sampling keeps the distribution uniform if the
+                # size of the range is not a power of two
+                random_id_list.extend(
+                    low + value
+                    for value in (
+                        int.from_bytes(random_bytes[offset:offset + 8], 'little') & mask
+                        for offset in range(0, len(random_bytes), 8))
+                    if value < size)
+
+        return random_id_list.pop()
+
+
+# Logger of the log function below
+logger = logging.getLogger('dblayer')
 
 
 def log(msg, *args):
-    """ Log
+    """ Logs a debug message
+    
+    The message is formatted with args only if it is actually emitted,
+    timestamps are added by the formatters of the logging handlers.
+    
     """
-    print
-    '%s: %s' % (
-        datetime.datetime.now().isoformat(' '),
-        msg % args)
+    if logger.isEnabledFor(logging.DEBUG):
+        logger.debug(msg, *args)
@@ -3,8 +3,8 @@ import setuptools
 # Get version info
 __version__ = None
 __release__ = None
-exec
-open('dblayer/version.py')
+with open('dblayer/version.py') as version_file:
+    exec(version_file.read())
 
 setuptools.setup(
     name='dblayer',
@@ -33,15 +33,7 @@ support for auto completion in Python IDEs.''',
     author_email='viktor@ferenczi.eu',
     url='http://code.google.com/p/dblayer',
     license='MIT',
-    packages=[
-        'dblayer',
-        'dblayer.backend.base',
-        'dblayer.backend.postgresql',
-        'dblayer.generator',
-        'dblayer.graph',
-        'dblayer.model',
-        'dblayer.test',
-    ],
+    packages=setuptools.find_packages(),
     package_data={
         '': ['template/*.tpl'],
     },